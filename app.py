@@ -3,15 +3,28 @@
 
 from flask import Flask, render_template, request, jsonify, session, url_for
 from datetime import datetime, date, timedelta, time
+import gzip
 import json
 import os
+import re
+from functools import lru_cache
 from flask.json.provider import DefaultJSONProvider
 
+try:
+    import orjson
+except ImportError:  # optional - falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional - gzip is used without it
+    brotli = None
+
 # Import services from services_init (singleton instances)
 from services_init import (
     db, ad_service, auto_scheduler, auto_schedule_service, audit_logger,
     constraints_service, committee_types_service, committee_recommendation_service,
-    auth_manager, calendar_service, calendar_sync_scheduler
+    auth_manager, calendar_service, calendar_sync_scheduler, cache
 )
 
 from db import cleanup_db
@@ -30,6 +43,12 @@ app.secret_key = os.getenv('FLASK_SECRET_KEY', 'committee_management_secret_key_
 
 # Custom JSON Provider to handle time objects
 class CustomJSONProvider(DefaultJSONProvider):
+    # Emit Hebrew as UTF-8 on the stdlib fallback too, matching orjson (\uXXXX escapes triple the bytes)
+    ensure_ascii = False
+    # Dates/times still go through default() so times keep the '%H:%M' format
+    ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS |
+                      orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
     def default(self, obj):
         if isinstance(obj, time):
             return obj.strftime('%H:%M')
@@ -37,6 +56,25 @@ class CustomJSONProvider(DefaultJSONProvider):
             return obj.isoformat()
         return super().default(obj)
 
+    def dumps(self, obj, **kwargs):
+        # orjson is several times faster for the large list payloads; its output is
+        # already compact, so only indented (debug) output keeps the stdlib path
+        if orjson is None or kwargs.get('indent'):
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, default=self.default, option=self.ORJSON_OPTIONS).decode()
+        except TypeError:
+            return super().dumps(obj)
+
+    def loads(self, s, **kwargs):
+        # Backs request.get_json(); the stdlib parser still handles what orjson rejects (NaN, huge ints)
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            return super().loads(s)
+
 app.json = CustomJSONProvider(app)
 
 # Session configuration
@@ -49,6 +87,17 @@ app.config['SESSION_COOKIE_SAMESITE'] = None  # Allow cross-site for OAuth redir
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(hours=session_lifetime_hours)
 app.config['SESSION_REFRESH_EACH_REQUEST'] = True
 
+# Cache configuration - Redis when REDIS_URL is set, in-process otherwise
+redis_url = os.getenv('REDIS_URL')
+if redis_url:
+    app.config['CACHE_TYPE'] = 'RedisCache'
+    app.config['CACHE_REDIS_URL'] = redis_url
+else:
+    app.config['CACHE_TYPE'] = 'SimpleCache'
+app.config['CACHE_DEFAULT_TIMEOUT'] = 300
+app.config['CACHE_KEY_PREFIX'] = 'izun:'
+cache.init_app(app)
+
 # Register Blueprints
 app.register_blueprint(main_bp)
 app.register_blueprint(auth_bp) # Routes like /login, /logout
@@ -90,22 +139,28 @@ def format_datetime_filter(value):
         return value.strftime('%Y-%m-%d %H:%M')
     return str(value)
 
+# Date string formats accepted by the format_date filter (YYYY-MM-DD and DD/MM/YYYY)
+_ISO_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+_DMY_DATE_RE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+
 @app.template_filter('format_date')
 def format_date_filter(value):
     """Format date to DD/MM/YYYY"""
     if value is None:
         return ''
     if isinstance(value, str):
+        # Match the accepted formats up front instead of letting strptime raise per format
+        match = _ISO_DATE_RE.fullmatch(value)
+        if match:
+            year, month, day = match.groups()
+        else:
+            match = _DMY_DATE_RE.fullmatch(value)
+            if not match:
+                return value
+            day, month, year = match.groups()
         try:
-            # Try to parse the string as a date
-            from datetime import date as date_type
-            for fmt in ('%Y-%m-%d', '%d/%m/%Y'):
-                try:
-                    value = datetime.strptime(value, fmt).date()
-                    break
-                except ValueError:
-                    continue
-        except:
+            value = date(int(year), int(month), int(day))
+        except ValueError:
             return value
     # Handle both date and datetime objects
     if hasattr(value, 'strftime'):
@@ -113,25 +168,73 @@ def format_date_filter(value):
     return str(value)
 
 # Mobile device detection middleware
+_MOBILE_UA_RE = re.compile(r'android|webos|i(?:phone|pad|pod)|blackberry|windows phone|mobile', re.IGNORECASE)
+
+@lru_cache(maxsize=1024)
+def _is_mobile_user_agent(user_agent: str) -> bool:
+    """Match a User-Agent against the mobile keywords (repeat clients hit the cache)"""
+    return _MOBILE_UA_RE.search(user_agent) is not None
+
 def is_mobile_device():
     """Detect if the request is from a mobile device"""
-    user_agent = request.headers.get('User-Agent', '').lower()
-    mobile_keywords = ['android', 'webos', 'iphone', 'ipad', 'ipod', 'blackberry', 'windows phone', 'mobile']
-    return any(keyword in user_agent for keyword in mobile_keywords)
+    return _is_mobile_user_agent(request.headers.get('User-Agent', ''))
+
+# Static files and API endpoints are exempt; resolved from the URL map once the hook is registered
+_mobile_exempt_endpoints = frozenset()
 
-@app.before_request
 def check_mobile_access():
-    """Block mobile device access (optional - can be disabled)"""
-    # Skip check for static files and API endpoints
-    if request.path.startswith('/static/') or request.path.startswith('/api/'):
+    """Block mobile device access (enabled with IZUN_BLOCK_MOBILE=1)"""
+    # The matched rule's endpoint is already known, so this is one set lookup instead of path prefix checks
+    if request.endpoint in _mobile_exempt_endpoints:
         return None
-    
-    # Uncomment the following lines to enable server-side mobile blocking
-    # if is_mobile_device():
-    #     return render_template('mobile_blocked.html'), 403
-    
+
+    if is_mobile_device():
+        return render_template('errors/auth_error.html',
+            title='גישה ממכשיר נייד',
+            message='המערכת זמינה ממחשב בלבד. אנא התחבר ממחשב שולחני.',
+            current_user=None), 403
+
     return None
 
+# Register the hook only when blocking is on, so the default config adds no per-request work
+if os.getenv('IZUN_BLOCK_MOBILE') == '1':
+    _mobile_exempt_endpoints = frozenset(
+        rule.endpoint for rule in app.url_map.iter_rules()
+        if rule.rule.startswith(('/static/', '/api/'))
+    )
+    app.before_request(check_mobile_access)
+
+# Response compression for pages and JSON (skips small, streamed and already-encoded responses)
+COMPRESS_MIN_SIZE = 1400
+COMPRESSIBLE_MIMETYPES = frozenset({
+    'text/html', 'text/css', 'text/plain', 'application/json', 'application/javascript', 'text/javascript'
+})
+
+@app.after_request
+def compress_response(response):
+    """Compress eligible responses with brotli (if installed) or gzip"""
+    if (response.status_code < 200 or response.status_code >= 300 or response.is_streamed
+            or response.direct_passthrough or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        encoding = 'br'
+    elif accepted['gzip']:
+        encoding = 'gzip'
+    else:
+        return response
+
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+
+    response.set_data(brotli.compress(data, quality=4) if encoding == 'br' else gzip.compress(data, compresslevel=6))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
 @app.teardown_appcontext
 def cleanup_sqlalchemy_session(exception=None):
     """Clean up SQLAlchemy session at end of each request."""
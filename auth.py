@@ -1,5 +1,5 @@
 from functools import wraps
-from flask import session, request, redirect, url_for, flash, jsonify
+from flask import session, request, redirect, url_for, flash, jsonify, g
 from database import DatabaseManager
 
 class AuthManager:
@@ -12,15 +12,22 @@ class AuthManager:
         session.clear()
     
     def get_current_user(self) -> dict:
-        """Get current logged in user info with hativot access"""
+        """Get current logged in user info with hativot access (memoized per request on flask.g)"""
         if 'user_id' not in session:
             return None
         
+        # Decorators, handlers and templates ask for the user several times per request;
+        # the key guards against a login/logout earlier in the same request
+        key = (session['user_id'], session['role'])
+        cached = g.get('_current_user')
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
         # Get user's hativot from database
         user_hativot = self.db.get_user_hativot(session['user_id'])
         hativa_ids = [h['hativa_id'] for h in user_hativot]
         
-        return {
+        user = {
             'user_id': session['user_id'],
             'username': session['username'],
             'role': session['role'],
@@ -28,22 +35,26 @@ class AuthManager:
             'hativot': user_hativot,
             'full_name': session['full_name']
         }
+        g._current_user = (key, user)
+        return user
     
     def is_logged_in(self) -> bool:
         """Check if user is logged in"""
         return 'user_id' in session
     
     def can_edit(self, target_hativa_id: int = None) -> tuple[bool, str]:
-        """Check if current user can edit"""
+        """Check if current user can edit (memoized per request on flask.g)"""
         if not self.is_logged_in():
             return False, "נדרשת התחברות"
         
-        user = self.get_current_user()
-        return self.db.can_user_edit(
-            user['user_id'],
-            user['role'], 
-            target_hativa_id
-        )
+        # The decorator and the route body often check the same hativa within one request;
+        # the user is part of the key, as in get_current_user(), to survive a login/logout
+        key = (session['user_id'], session['role'], target_hativa_id)
+        checked = g.setdefault('_can_edit', {})
+        if key not in checked:
+            # Only id and role are needed - skip get_current_user()'s hativot query
+            checked[key] = self.db.can_user_edit(*key)
+        return checked[key]
 
 # Decorators for route protection
 def login_required(f):
@@ -4,8 +4,20 @@
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional, Tuple
 import calendar
+from collections import Counter, defaultdict
 from database import DatabaseManager
 
+def _as_date(value) -> date:
+    """
+    המרת תאריך ממסד הנתונים (date או מחרוזת ISO) לאובייקט date
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    # date.fromisoformat is implemented in C - no format-string parsing per row
+    return date.fromisoformat(value)
+
 class AutoMeetingScheduler:
     """
     מנגנון יצירה אוטומטית של ישיבות וועדות על בסיס אילוצים עסקיים
@@ -82,8 +94,9 @@ class AutoMeetingScheduler:
             return False, "התאריך אינו יום עסקים (שבת/חג/יום שבתון)"
         
         # קבלת פרטי סוג הועדה מהמסד נתונים
-        committee_types = self.db.get_committee_types(hativa_id)
-        committee_type_data = next((ct for ct in committee_types if ct['committee_type_id'] == committee_type_id), None)
+        committee_type_data = self.db.get_committee_type_by_id(committee_type_id)
+        if committee_type_data and committee_type_data['hativa_id'] != hativa_id:
+            committee_type_data = None
         
         if not committee_type_data:
             return False, f"סוג ועדה לא נמצא: {committee_type_id}"
@@ -147,7 +160,7 @@ class AutoMeetingScheduler:
                 meeting.get('hativa_id') == hativa_id and 
                 meeting.get('vaada_date')):
                 try:
-                    meeting_date = datetime.strptime(meeting['vaada_date'], '%Y-%m-%d').date()
+                    meeting_date = _as_date(meeting['vaada_date'])
                     # בדיקה שלא עברו פחות מ-7 ימים (למניעת כפילות שבועיות)
                     if frequency == 'weekly' and abs((meeting_date - target_date).days) < 7:
                         return False, "קיימת כבר ישיבה דומה לאותה חטיבה השבוע"
@@ -170,8 +183,9 @@ class AutoMeetingScheduler:
             start_date = date.today()
         
         # קבלת פרטי סוג הועדה מהמסד נתונים
-        committee_types = self.db.get_committee_types(hativa_id)
-        committee_type_data = next((ct for ct in committee_types if ct['committee_type_id'] == committee_type_id), None)
+        committee_type_data = self.db.get_committee_type_by_id(committee_type_id)
+        if committee_type_data and committee_type_data['hativa_id'] != hativa_id:
+            committee_type_data = None
         
         if not committee_type_data:
             return None
@@ -216,13 +230,8 @@ class AutoMeetingScheduler:
         if max_results <= 0:
             return []
 
-        committee_types = self.db.get_committee_types(hativa_id)
-        committee_type_data = next(
-            (ct for ct in committee_types if ct['committee_type_id'] == committee_type_id),
-            None
-        )
-
-        if not committee_type_data:
+        committee_type_data = self.db.get_committee_type_by_id(committee_type_id)
+        if not committee_type_data or committee_type_data['hativa_id'] != hativa_id:
             return []
 
         expected_weekday = committee_type_data['scheduled_day']
@@ -283,12 +292,12 @@ class AutoMeetingScheduler:
         for hativa_id in hativot_ids:
             cached_committee_types[hativa_id] = self.db.get_committee_types(hativa_id)
         
-        # Build a set of dates with meetings for quick lookup
-        cached_meeting_dates = set()
+        # Count meetings per date for O(1) daily-limit lookups
+        cached_meeting_dates = Counter()
         for meeting in cached_vaadot:
             if meeting.get('vaada_date'):
                 try:
-                    cached_meeting_dates.add(meeting['vaada_date'])
+                    cached_meeting_dates[_as_date(meeting['vaada_date'])] += 1
                 except (ValueError, TypeError):
                     pass
         # ===== END OPTIMIZATION =====
@@ -362,7 +371,7 @@ class AutoMeetingScheduler:
                                           committee_type_data: Dict,
                                           constraint_settings: Dict,
                                           cached_vaadot: List[Dict],
-                                          cached_meeting_dates: set) -> Optional[date]:
+                                          cached_meeting_dates: Dict[date, int]) -> Optional[date]:
         """
         מציאת התאריך הזמין הבא לועדה - גרסה מותאמת עם cache
         """
@@ -405,7 +414,7 @@ class AutoMeetingScheduler:
                                       hativa_id: int, committee_type_data: Dict,
                                       constraint_settings: Dict,
                                       cached_vaadot: List[Dict],
-                                      cached_meeting_dates: set,
+                                      cached_meeting_dates: Dict[date, int],
                                       is_admin: bool = False) -> Tuple[bool, str]:
         """
         בדיקה האם ניתן לתזמן ישיבה בתאריך נתון - גרסה מותאמת עם cache
@@ -435,8 +444,7 @@ class AutoMeetingScheduler:
         warnings = []
 
         # בדיקת ועדה אחת ביום - using cached data
-        date_str = target_date.strftime('%Y-%m-%d')
-        meetings_on_date = sum(1 for d in cached_meeting_dates if d == date_str)
+        meetings_on_date = cached_meeting_dates.get(target_date, 0)
         max_per_day = constraint_settings['max_meetings_per_day']
         
         if meetings_on_date >= max_per_day:
@@ -473,7 +481,7 @@ class AutoMeetingScheduler:
                 meeting.get('hativa_id') == hativa_id and 
                 meeting.get('vaada_date')):
                 try:
-                    meeting_date = datetime.strptime(meeting['vaada_date'], '%Y-%m-%d').date()
+                    meeting_date = _as_date(meeting['vaada_date'])
                     if frequency == 'weekly' and abs((meeting_date - target_date).days) < 7:
                         return False, "קיימת כבר ישיבה דומה לאותה חטיבה השבוע"
                     elif frequency == 'monthly' and meeting_date.month == target_date.month and meeting_date.year == target_date.year:
@@ -497,7 +505,7 @@ class AutoMeetingScheduler:
                 # המרת תאריך לאובייקט date אם נדרש
                 suggested_date = suggestion['suggested_date']
                 if isinstance(suggested_date, str):
-                    suggested_date = datetime.strptime(suggested_date, '%Y-%m-%d').date()
+                    suggested_date = _as_date(suggested_date)
                 
                 # בדיקה נוספת לפני יצירה
                 can_create, reason = self.can_schedule_meeting(
@@ -546,42 +554,42 @@ class AutoMeetingScheduler:
         """
         אימות שהלוח הזמנים עומד באילוצים
         """
-        start_date = date(year, month, 1)
-        if month == 12:
-            end_date = date(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = date(year, month + 1, 1) - timedelta(days=1)
-        
-        meetings = self.db.get_vaadot()
-        monthly_meetings = []
-        
-        for meeting in meetings:
-            if meeting.get('vaada_date'):
-                try:
-                    meeting_date = datetime.strptime(meeting['vaada_date'], '%Y-%m-%d').date()
-                    if start_date <= meeting_date <= end_date:
-                        monthly_meetings.append(meeting)
-                except (ValueError, TypeError):
-                    continue
+        return self.validate_schedule_constraints_bulk(year, [month])[month]
+    
+    def validate_schedule_constraints_bulk(self, year: int, months: List[int]) -> Dict[int, Dict]:
+        """
+        אימות אילוצי הלוח עבור מספר חודשים באותה שנה בשאילתה אחת
+        מחזיר מילון של תוצאת אימות לפי חודש
+        """
+        months = sorted(set(months))
+        if not months:
+            return {}
         
-        violations = []
-        warnings = []
+        start_date = date(year, months[0], 1)
+        end_date = date(year, months[-1], calendar.monthrange(year, months[-1])[1])
         
-        # בדיקת אילוצים
-        for meeting in monthly_meetings:
+        # שליפת כל הישיבות בטווח פעם אחת וחלוקה לפי חודש
+        meeting_dates_by_month = defaultdict(list)
+        for meeting in self.db.get_vaadot(start_date=start_date, end_date=end_date):
             if meeting.get('vaada_date'):
                 try:
-                    meeting_date = datetime.strptime(meeting['vaada_date'], '%Y-%m-%d').date()
-                    
-                    # בדיקת יום עסקים
-                    if not self.is_business_day(meeting_date):
-                        violations.append(f"ישיבה בתאריך {meeting_date} אינה ביום עסקים")
+                    meeting_date = _as_date(meeting['vaada_date'])
                 except (ValueError, TypeError):
                     continue
+                meeting_dates_by_month[meeting_date.month].append(meeting_date)
         
-        return {
-            'valid': len(violations) == 0,
-            'violations': violations,
-            'warnings': warnings,
-            'total_meetings': len(monthly_meetings)
-        }
+        results = {}
+        for month in months:
+            meeting_dates = meeting_dates_by_month.get(month, [])
+            
+            # בדיקת יום עסקים
+            violations = [f"ישיבה בתאריך {meeting_date} אינה ביום עסקים"
+                          for meeting_date in meeting_dates if not self.is_business_day(meeting_date)]
+            
+            results[month] = {
+                'valid': len(violations) == 0,
+                'violations': violations,
+                'warnings': [],
+                'total_meetings': len(meeting_dates)
+            }
+        return results
@@ -1,12 +1,15 @@
+import logging
 import os
 import re
+import time
 import urllib.parse
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Iterator
 from zoneinfo import ZoneInfo
 
 # SQLAlchemy ORM imports
-from db import get_db_session
+from sqlalchemy import text
+from db import get_db_session, get_ref_data_version
 from repositories import (
     HativaRepository, MaslulRepository, CommitteeTypeRepository,
     VaadaRepository, EventRepository, UserRepository, SettingsRepository,
@@ -14,19 +17,65 @@ from repositories import (
     CalendarSyncRepository
 )
 
+logger = logging.getLogger(__name__)
+
 ISRAEL_TZ = ZoneInfo('Asia/Jerusalem')
 
+# Max IDs per IN (...) clause - stays under SQLite's classic 999 bound-parameter limit
+IN_CLAUSE_CHUNK = 900
+
+# Seconds a system setting read is served from memory; writes through this class invalidate immediately
+SETTINGS_CACHE_TTL = 5.0
+
+# Seconds reference rows are served from memory; app commits invalidate immediately via the
+# ref-data version, the TTL bounds staleness from writes made outside this process
+REF_CACHE_TTL = 30.0
+
 class DatabaseManager:
     def __init__(self, db_path: str = None):
         # Database initialized via db.init_database() in app.py or manual calls
         self.init_database()
+        # Reference-data lookups cached per ref-data version for REF_CACHE_TTL: {key: (version, rows, expires_at)}
+        self._ref_cache: Dict[tuple, tuple] = {}
+        # By-id indexes over the cached rows: {key: (rows, index)}
+        self._ref_index: Dict[tuple, tuple] = {}
+        # System settings cached for SETTINGS_CACHE_TTL: {key: (value, expires_at)}
+        self._settings_cache: Dict[str, Tuple[Optional[str], float]] = {}
+
+    def _ref_rows(self, key: tuple, loader) -> List[Dict]:
+        """Return the cached reference rows themselves, reloading after any ref-data commit or REF_CACHE_TTL"""
+        version = get_ref_data_version()
+        now = time.monotonic()
+        hit = self._ref_cache.get(key)
+        if hit is None or hit[0] != version or hit[2] <= now:
+            hit = (version, loader(), now + REF_CACHE_TTL)
+            self._ref_cache[key] = hit
+        return hit[1]
+
+    def _cached_ref_rows(self, key: tuple, loader) -> List[Dict]:
+        """Return reference rows from the in-process cache, reloading after any ref-data commit"""
+        # Shallow copies so callers that annotate rows don't mutate the cache
+        return [dict(row) for row in self._ref_rows(key, loader)]
+
+    def _cached_ref_row(self, key: tuple, loader, id_field: str, row_id: Any) -> Optional[Dict]:
+        """Return one cached reference row by ID via an index built once per cached row list"""
+        rows = self._ref_rows(key, loader)
+        index_key = key + ('by', id_field)
+        hit = self._ref_index.get(index_key)
+        if hit is None or hit[0] is not rows:
+            hit = (rows, {row[id_field]: row for row in rows})
+            self._ref_index[index_key] = hit
+        row = hit[1].get(row_id)
+        return dict(row) if row is not None else None
 
     def init_database(self):
         """Initialize database using SQLAlchemy and seed default settings"""
-        from db import init_database as sa_init_database
+        from db import init_database as sa_init_database, ensure_indexes
         
         # Create all tables defined in models.py
         sa_init_database()
+        # Add indexes introduced after the tables were first created
+        ensure_indexes()
         
         # Seed default settings
         with get_db_session() as session:
@@ -78,7 +127,15 @@ class DatabaseManager:
             return hativa.hativa_id
     
     def get_hativot(self) -> List[Dict]:
-        """Get all divisions using SQLAlchemy"""
+        """Get all divisions (cached until reference data changes)"""
+        return self._cached_ref_rows(('hativot',), self._load_hativot)
+
+    def get_hativa_by_id(self, hativa_id: int) -> Optional[Dict]:
+        """Get a single division as returned by get_hativot (cached until reference data changes)"""
+        return self._cached_ref_row(('hativot',), self._load_hativot, 'hativa_id', hativa_id)
+
+    def _load_hativot(self) -> List[Dict]:
+        """Load all divisions using SQLAlchemy"""
         with get_db_session() as session:
             repo = HativaRepository(session)
             hativot = repo.get_all(include_inactive=True)
@@ -137,7 +194,11 @@ class DatabaseManager:
             return maslul.maslul_id
     
     def get_maslulim(self, hativa_id: Optional[int] = None) -> List[Dict]:
-        """Get routes, optionally filtered by division using SQLAlchemy"""
+        """Get routes, optionally filtered by division (cached until reference data changes)"""
+        return self._cached_ref_rows(('maslulim', hativa_id), lambda: self._load_maslulim(hativa_id))
+
+    def _load_maslulim(self, hativa_id: Optional[int] = None) -> List[Dict]:
+        """Load routes, optionally filtered by division using SQLAlchemy"""
         with get_db_session() as session:
             repo = MaslulRepository(session)
             maslulim = repo.get_all(hativa_id=hativa_id)
@@ -158,11 +219,12 @@ class DatabaseManager:
             return repo.hard_delete(maslul_id)
     
     # Exception dates operations
-    def add_exception_date(self, exception_date: date, description: str = "", date_type: str = "holiday"):
+    def add_exception_date(self, exception_date: date, description: str = "", date_type: str = "holiday") -> int:
         """Add an exception date using SQLAlchemy"""
         with get_db_session() as session:
             repo = ExceptionDateRepository(session)
-            repo.create(exception_date, description, date_type)
+            item = repo.create(exception_date, description, date_type)
+            return item.date_id
     
     def get_exception_dates(self, include_past: bool = False) -> List[Dict]:
         """Get exception dates using SQLAlchemy"""
@@ -171,6 +233,12 @@ class DatabaseManager:
             items = repo.get_exception_dates(include_past)
             return [item.to_dict() for item in items]
     
+    def count_exception_dates(self, include_past: bool = False) -> int:
+        """Count exception dates using SQLAlchemy"""
+        with get_db_session() as session:
+            repo = ExceptionDateRepository(session)
+            return repo.count_exception_dates(include_past)
+    
     def get_exception_date_by_id(self, date_id: int) -> Optional[Dict]:
         """Get a specific exception date by ID using SQLAlchemy"""
         with get_db_session() as session:
@@ -207,7 +275,9 @@ class DatabaseManager:
             
             # 1. Get all active events
             active_events = event_repo.get_all_active()
-            work_days = settings_repo.get_work_days()
+            is_work_day = exception_repo.work_day_checker(settings_repo.get_work_days())
+            # Events sharing a meeting date and stage durations get the same deadlines
+            stage_dates_cache = {}
             updated_count = 0
             
             for event in active_events:
@@ -217,11 +287,10 @@ class DatabaseManager:
                     continue
                     
                 # 2. Recalculate stage dates
-                stage_dates = event_repo.calculate_stage_dates(
-                    vaada.vaada_date,
-                    maslul.stage_a_days, maslul.stage_b_days, maslul.stage_c_days, maslul.stage_d_days,
-                    lambda d: exception_repo.is_work_day(d, work_days)
-                )
+                key = (vaada.vaada_date, maslul.stage_a_days, maslul.stage_b_days, maslul.stage_c_days, maslul.stage_d_days)
+                stage_dates = stage_dates_cache.get(key)
+                if stage_dates is None:
+                    stage_dates = stage_dates_cache[key] = event_repo.calculate_stage_dates(*key, is_work_day)
                 
                 # 3. Update the event with new deadline dates (skipping manual call deadlines if they were set)
                 # Note: Original code updated ALL fields including call_deadline. 
@@ -251,7 +320,9 @@ class DatabaseManager:
                 
             # Get all events for this maslul
             events = event_repo.get_by_maslul(maslul_id)
-            work_days = settings_repo.get_work_days()
+            is_work_day = exception_repo.work_day_checker(settings_repo.get_work_days())
+            # Events of one maslul on the same meeting date get the same deadlines
+            stage_dates_cache = {}
             updated_count = 0
             
             for event in events:
@@ -260,11 +331,13 @@ class DatabaseManager:
                     continue
                     
                 # Recalculate using maslul's current values
-                stage_dates = event_repo.calculate_stage_dates(
-                    vaada.vaada_date,
-                    maslul.stage_a_days, maslul.stage_b_days, maslul.stage_c_days, maslul.stage_d_days,
-                    lambda d: exception_repo.is_work_day(d, work_days)
-                )
+                stage_dates = stage_dates_cache.get(vaada.vaada_date)
+                if stage_dates is None:
+                    stage_dates = stage_dates_cache[vaada.vaada_date] = event_repo.calculate_stage_dates(
+                        vaada.vaada_date,
+                        maslul.stage_a_days, maslul.stage_b_days, maslul.stage_c_days, maslul.stage_d_days,
+                        is_work_day
+                    )
                 
                 event.call_deadline_date = stage_dates['call_deadline_date']
                 event.intake_deadline_date = stage_dates['intake_deadline_date']
@@ -285,17 +358,28 @@ class DatabaseManager:
             return ct.committee_type_id
     
     def get_committee_types(self, hativa_id: Optional[int] = None) -> List[Dict]:
-        """Get committee types using SQLAlchemy"""
+        """Get committee types (cached until reference data changes)"""
+        return self._cached_ref_rows(('committee_types', hativa_id), lambda: self._load_committee_types(hativa_id))
+
+    def _load_committee_types(self, hativa_id: Optional[int] = None) -> List[Dict]:
+        """Load committee types using SQLAlchemy"""
         with get_db_session() as session:
             repo = CommitteeTypeRepository(session)
             cts = repo.get_all(hativa_id=hativa_id)
-            days = ['יום ראשון', 'יום שני', 'יום שלישי', 'יום רביעי', 'יום חמישי', 'יום שישי', 'שבת']
-            result = []
-            for ct in cts:
-                d = ct.to_dict()
-                d['scheduled_day_name'] = days[ct.scheduled_day] if ct.scheduled_day is not None else ''
-                result.append(d)
-            return result
+            return [self._committee_type_to_dict(ct) for ct in cts]
+
+    def get_committee_type_by_id(self, committee_type_id: int) -> Optional[Dict]:
+        """Get a single committee type (cached until reference data changes)"""
+        return self._cached_ref_row(('committee_types', None), lambda: self._load_committee_types(None),
+                                    'committee_type_id', committee_type_id)
+
+    @staticmethod
+    def _committee_type_to_dict(ct) -> Dict:
+        """Convert a committee type to the dict shape returned by get_committee_types"""
+        days = ['יום ראשון', 'יום שני', 'יום שלישי', 'יום רביעי', 'יום חמישי', 'יום שישי', 'שבת']
+        d = ct.to_dict()
+        d['scheduled_day_name'] = days[ct.scheduled_day] if ct.scheduled_day is not None else ''
+        return d
     
     def update_committee_type(self, committee_type_id: int, hativa_id: int, name: str, scheduled_day: int, 
                              frequency: str = 'weekly', week_of_month: Optional[int] = None, 
@@ -420,6 +504,12 @@ class DatabaseManager:
             max_per_day = self.get_int_setting('max_meetings_per_day', 1)
             return count < max_per_day
     
+    def date_has_other_vaada(self, vaada_date: date, exclude_vaada_id: Optional[int] = None) -> bool:
+        """Check whether another active committee meeting exists on a date using SQLAlchemy"""
+        with get_db_session() as session:
+            repo = VaadaRepository(session)
+            return not repo.is_date_available(vaada_date, exclude_vaadot_id=exclude_vaada_id)
+    
     def get_vaadot(self, hativa_id: Optional[int] = None, start_date: Optional[date] = None, 
                    end_date: Optional[date] = None, include_deleted: bool = False) -> List[Dict]:
         """Get committee meetings using SQLAlchemy"""
@@ -573,78 +663,110 @@ class DatabaseManager:
 
         try:
             with get_db_session() as session:
-                vaada_repo = VaadaRepository(session)
-                event_repo = EventRepository(session)
-                hativa_repo = HativaRepository(session)
-                settings_repo = SettingsRepository(session)
-                exception_repo = ExceptionDateRepository(session)
-                
-                # 1. Basic Work Day Check
-                work_days = settings_repo.get_work_days()
-                if not exception_repo.is_work_day(vaada_date, work_days):
-                    raise ValueError(f"התאריך {vaada_date} אינו יום עסקים חוקי לועדות")
-
-                # 2. Fetch Vaada
-                vaada = vaada_repo.get_by_id(vaadot_id)
-                if not vaada:
-                    return False
-                    
-                # 3. Hativa Day Allowance (non-admin)
-                if user_role != 'admin':
-                    allowed_days = hativa_repo.get_allowed_days(vaada.hativa_id)
-                    if vaada_date.weekday() not in allowed_days:
-                        day_names = ['יום שני', 'יום שלישי', 'יום רביעי', 'יום חמישי', 'יום שישי', 'יום שבת', 'יום ראשון']
-                        day_name = day_names[vaada_date.weekday()]
-                        allowed_day_names = [day_names[d] for d in sorted(allowed_days)]
-                        raise ValueError(f'התאריך {vaada_date} ({day_name}) אינו יום מותר לקביעת ועדות עבור חטיבה זו. הימים המותרים: {", ".join(allowed_day_names)}')
-
-                # 4. Daily Capacity
-                max_per_day = settings_repo.get_int_setting('max_meetings_per_day', 1)
-                count_on_date = vaada_repo.count_meetings_on_date(vaada_date)
-                if vaada.vaada_date != vaada_date and count_on_date >= max_per_day:
-                    raise ValueError(f"התאריך {vaada_date} כבר מכיל {count_on_date} ועדות (המגבלה היא {max_per_day})")
-
-                # 5. Weekly Capacity
-                week_start, week_end = vaada_repo.get_week_bounds(vaada_date)
-                weekly_count = vaada_repo.get_weekly_count(week_start, week_end, exclude_vaada_id=vaadot_id)
-                constraint_settings = settings_repo.get_constraint_settings()
-                limit_key = 'max_meetings_per_week_third' if vaada_repo.is_third_week_of_month(vaada_date) else 'max_meetings_per_week_regular'
-                weekly_limit = int(constraint_settings.get(limit_key, 3))
-                
-                if weekly_count >= weekly_limit:
-                    week_type = "שבוע שלישי" if vaada_repo.is_third_week_of_month(vaada_date) else "שבוע רגיל"
-                    raise ValueError(f"השבוע של {vaada_date} ({week_type}) כבר מכיל {weekly_count} ועדות. העברת הועדה תגרום לסך של {weekly_count+1} ועדות (המגבלה היא {weekly_limit})")
-
-                # 6. Check derived constraints for each event
-                events = [e for e in vaada.events if (e.is_deleted == 0 or e.is_deleted is None)]
-                for event in events:
-                    maslul = event.maslul
-                    stage_dates = event_repo.calculate_stage_dates(
-                        vaada_date,
-                        maslul.stage_a_days, maslul.stage_b_days, maslul.stage_c_days, maslul.stage_d_days,
-                        lambda d: exception_repo.is_work_day(d, work_days)
-                    )
-                    derived_error = event_repo.check_derived_dates_constraints(stage_dates, event.expected_requests, exclude_event_id=event.event_id)
-                    if derived_error:
-                        raise ValueError(f"העברת הועדה תגרום לחריגה באירוע {event.event_id}: {derived_error}")
-
-                # 7. Apply Update
-                vaada.vaada_date = vaada_date
-                vaada.exception_date_id = exception_date_id
-                session.flush()
-                return True
+                return self._apply_vaada_date(session, vaadot_id, vaada_date, exception_date_id, user_role)
         except ValueError:
             raise
         except Exception as e:
             print(f"Error updating vaada date: {e}")
             return False
 
+    def _apply_vaada_date(self, session, vaadot_id: int, vaada_date: date, exception_date_id: Optional[int] = None,
+                          user_role: Optional[str] = None) -> bool:
+        """Validate and apply a committee date change inside an open session"""
+        vaada_repo = VaadaRepository(session)
+        event_repo = EventRepository(session)
+        hativa_repo = HativaRepository(session)
+        settings_repo = SettingsRepository(session)
+        exception_repo = ExceptionDateRepository(session)
+        
+        # 1. Basic Work Day Check
+        work_days = settings_repo.get_work_days()
+        if not exception_repo.is_work_day(vaada_date, work_days):
+            raise ValueError(f"התאריך {vaada_date} אינו יום עסקים חוקי לועדות")
+
+        # 2. Fetch Vaada
+        vaada = vaada_repo.get_by_id(vaadot_id)
+        if not vaada:
+            return False
+            
+        # 3. Hativa Day Allowance (non-admin)
+        if user_role != 'admin':
+            allowed_days = hativa_repo.get_allowed_days(vaada.hativa_id)
+            if vaada_date.weekday() not in allowed_days:
+                day_names = ['יום שני', 'יום שלישי', 'יום רביעי', 'יום חמישי', 'יום שישי', 'יום שבת', 'יום ראשון']
+                day_name = day_names[vaada_date.weekday()]
+                allowed_day_names = [day_names[d] for d in sorted(allowed_days)]
+                raise ValueError(f'התאריך {vaada_date} ({day_name}) אינו יום מותר לקביעת ועדות עבור חטיבה זו. הימים המותרים: {", ".join(allowed_day_names)}')
+
+        # 4. Daily Capacity
+        max_per_day = settings_repo.get_int_setting('max_meetings_per_day', 1)
+        count_on_date = vaada_repo.count_meetings_on_date(vaada_date)
+        if vaada.vaada_date != vaada_date and count_on_date >= max_per_day:
+            raise ValueError(f"התאריך {vaada_date} כבר מכיל {count_on_date} ועדות (המגבלה היא {max_per_day})")
+
+        # 5. Weekly Capacity
+        week_start, week_end = vaada_repo.get_week_bounds(vaada_date)
+        weekly_count = vaada_repo.get_weekly_count(week_start, week_end, exclude_vaada_id=vaadot_id)
+        constraint_settings = settings_repo.get_constraint_settings()
+        limit_key = 'max_meetings_per_week_third' if vaada_repo.is_third_week_of_month(vaada_date) else 'max_meetings_per_week_regular'
+        weekly_limit = int(constraint_settings.get(limit_key, 3))
+        
+        if weekly_count >= weekly_limit:
+            week_type = "שבוע שלישי" if vaada_repo.is_third_week_of_month(vaada_date) else "שבוע רגיל"
+            raise ValueError(f"השבוע של {vaada_date} ({week_type}) כבר מכיל {weekly_count} ועדות. העברת הועדה תגרום לסך של {weekly_count+1} ועדות (המגבלה היא {weekly_limit})")
+
+        # 6. Check derived constraints for each event
+        events = [e for e in vaada.events if (e.is_deleted == 0 or e.is_deleted is None)]
+        is_work_day = exception_repo.work_day_checker(work_days)
+        for event in events:
+            maslul = event.maslul
+            stage_dates = event_repo.calculate_stage_dates(
+                vaada_date,
+                maslul.stage_a_days, maslul.stage_b_days, maslul.stage_c_days, maslul.stage_d_days,
+                is_work_day
+            )
+            derived_error = event_repo.check_derived_dates_constraints(stage_dates, event.expected_requests, exclude_event_id=event.event_id)
+            if derived_error:
+                raise ValueError(f"העברת הועדה תגרום לחריגה באירוע {event.event_id}: {derived_error}")
+
+        # 7. Apply Update
+        vaada.vaada_date = vaada_date
+        vaada.exception_date_id = exception_date_id
+        session.flush()
+        return True
+
     def delete_vaada(self, vaadot_id: int, user_id: Optional[int] = None) -> bool:
         """Soft delete a committee meeting using SQLAlchemy"""
         with get_db_session() as session:
             repo = VaadaRepository(session)
             return repo.soft_delete(vaadot_id, user_id)
 
+    def get_vaadot_minimal_by_ids(self, vaadot_ids: List[int]) -> List[Dict]:
+        """Get ID, division and name of active committee meetings by ID using SQLAlchemy"""
+        result = []
+        with get_db_session() as session:
+            repo = VaadaRepository(session)
+            for start in range(0, len(vaadot_ids), IN_CLAUSE_CHUNK):
+                for vaadot_id, hativa_id, committee_name in repo.get_minimal_by_ids(vaadot_ids[start:start + IN_CLAUSE_CHUNK]):
+                    result.append({
+                        'vaadot_id': vaadot_id,
+                        'hativa_id': hativa_id,
+                        'committee_name': committee_name
+                    })
+        return result
+
+    def get_vaada_names_outside_hativot(self, vaadot_ids: List[int], hativa_ids: List[int], limit: int = 5) -> List[str]:
+        """Get up to `limit` names of selected committee meetings outside the given divisions using SQLAlchemy"""
+        names = []
+        with get_db_session() as session:
+            repo = VaadaRepository(session)
+            for start in range(0, len(vaadot_ids), IN_CLAUSE_CHUNK):
+                names.extend(repo.get_names_outside_hativot(vaadot_ids[start:start + IN_CLAUSE_CHUNK], hativa_ids,
+                                                            limit - len(names)))
+                if len(names) >= limit:
+                    break
+        return names
+
     def delete_vaadot_bulk(self, vaadot_ids: List[int], user_id: Optional[int] = None) -> Tuple[int, int]:
         """
         Bulk soft delete committee meetings (vaadot) by IDs using SQLAlchemy.
@@ -776,7 +898,7 @@ class DatabaseManager:
             stage_dates = event_repo.calculate_stage_dates(
                 vaada.vaada_date,
                 maslul.stage_a_days, maslul.stage_b_days, maslul.stage_c_days, maslul.stage_d_days,
-                lambda d: exception_repo.is_work_day(d, work_days)
+                exception_repo.work_day_checker(work_days)
             )
             
             # 4. Handle manual deadline
@@ -867,7 +989,7 @@ class DatabaseManager:
             stage_dates = event_repo.calculate_stage_dates(
                 vaada.vaada_date,
                 maslul.stage_a_days, maslul.stage_b_days, maslul.stage_c_days, maslul.stage_d_days,
-                lambda d: exception_repo.is_work_day(d, work_days)
+                exception_repo.work_day_checker(work_days)
             )
             
             # 6. Handle manual deadline
@@ -901,11 +1023,57 @@ class DatabaseManager:
             repo = EventRepository(session)
             return repo.soft_delete(event_id, user_id)
 
+    def get_events_by_ids(self, event_ids: List[int]) -> List[Dict]:
+        """Get active events by ID with their route's division using SQLAlchemy"""
+        result = []
+        with get_db_session() as session:
+            repo = EventRepository(session)
+            for start in range(0, len(event_ids), IN_CLAUSE_CHUNK):
+                for e in repo.get_active_by_ids(event_ids[start:start + IN_CLAUSE_CHUNK]):
+                    result.append({
+                        'event_id': e.event_id,
+                        'name': e.name,
+                        'vaadot_id': e.vaadot_id,
+                        'maslul_hativa_id': e.maslul.hativa_id if e.maslul else None
+                    })
+        return result
+
+    def get_event_names_outside_hativot(self, event_ids: List[int], hativa_ids: List[int], limit: int = 5) -> List[str]:
+        """Get up to `limit` names of selected events outside the given divisions using SQLAlchemy"""
+        names = []
+        with get_db_session() as session:
+            repo = EventRepository(session)
+            for start in range(0, len(event_ids), IN_CLAUSE_CHUNK):
+                names.extend(repo.get_names_outside_hativot(event_ids[start:start + IN_CLAUSE_CHUNK], hativa_ids,
+                                                            limit - len(names)))
+                if len(names) >= limit:
+                    break
+        return names
+
+    def delete_events_by_vaada(self, vaadot_id: int, user_id: Optional[int] = None) -> List[Dict]:
+        """Soft delete all events of a committee meeting and return their IDs and names using SQLAlchemy"""
+        with get_db_session() as session:
+            repo = EventRepository(session)
+            return repo.bulk_soft_delete_by_vaada(vaadot_id, user_id)
+
+    def count_events_by_maslul(self, maslul_id: int, include_deleted: bool = True) -> int:
+        """Count events using a route using SQLAlchemy"""
+        with get_db_session() as session:
+            repo = EventRepository(session)
+            return repo.count_by_maslul(maslul_id, include_deleted)
+
+    def get_event_examples_by_maslul(self, maslul_id: int, limit: int = 5) -> List[Dict]:
+        """Get names and dates of the latest events using a route using SQLAlchemy"""
+        with get_db_session() as session:
+            repo = EventRepository(session)
+            return repo.get_name_and_date_by_maslul(maslul_id, limit)
+
     def delete_events_bulk(self, event_ids: List[int], user_id: Optional[int] = None) -> int:
         """Bulk soft delete events using SQLAlchemy"""
         with get_db_session() as session:
             repo = EventRepository(session)
-            return repo.bulk_soft_delete(event_ids, user_id)
+            return sum(repo.bulk_soft_delete(event_ids[start:start + IN_CLAUSE_CHUNK], user_id)
+                       for start in range(0, len(event_ids), IN_CLAUSE_CHUNK))
     
     # User Management and Permissions
     
@@ -987,6 +1155,13 @@ class DatabaseManager:
             repo = UserRepository(session)
             return repo.email_exists(email, exclude_user_id)
     
+    def check_user_conflicts(self, username: str, email: str,
+                             exclude_user_id: Optional[int] = None) -> Tuple[bool, bool]:
+        """Check if username and/or email already exist in one query using SQLAlchemy"""
+        with get_db_session() as session:
+            repo = UserRepository(session)
+            return repo.find_conflicts(username, email, exclude_user_id)
+    
     def get_user_hativot(self, user_id: int) -> List[Dict]:
         """Get all hativot for a user using SQLAlchemy"""
         with get_db_session() as session:
@@ -1018,22 +1193,71 @@ class DatabaseManager:
             return repo.remove_hativa_access(user_id, hativa_id)
     
     def get_system_setting(self, setting_key: str) -> Optional[str]:
-        """Get system setting value using SQLAlchemy"""
+        """Get system setting value (cached for SETTINGS_CACHE_TTL seconds) using SQLAlchemy"""
+        now = time.monotonic()
+        hit = self._settings_cache.get(setting_key)
+        if hit is not None and hit[1] > now:
+            return hit[0]
         with get_db_session() as session:
             repo = SettingsRepository(session)
-            return repo.get_setting(setting_key)
+            value = repo.get_setting(setting_key)
+        self._settings_cache[setting_key] = (value, now + SETTINGS_CACHE_TTL)
+        return value
+    
+    def get_system_settings(self, setting_keys: List[str]) -> Dict[str, Optional[str]]:
+        """Get several system setting values, fetching uncached keys in one query using SQLAlchemy"""
+        now = time.monotonic()
+        values = {}
+        missing = []
+        for key in setting_keys:
+            hit = self._settings_cache.get(key)
+            if hit is not None and hit[1] > now:
+                values[key] = hit[0]
+            else:
+                missing.append(key)
+        if missing:
+            with get_db_session() as session:
+                repo = SettingsRepository(session)
+                fetched = repo.get_settings(missing)
+            for key, value in fetched.items():
+                self._settings_cache[key] = (value, now + SETTINGS_CACHE_TTL)
+            values.update(fetched)
+        return values
     
     def update_system_setting(self, setting_key: str, setting_value: str, user_id: int):
         """Update system setting using SQLAlchemy"""
         with get_db_session() as session:
             repo = SettingsRepository(session)
             repo.update_setting(setting_key, setting_value, user_id)
+        self._settings_cache.pop(setting_key, None)
 
-    def get_int_setting(self, setting_key: str, default: int) -> int:
-        """Get an integer system setting with fallback using SQLAlchemy"""
+    def update_system_settings(self, settings: Dict[str, str], user_id: int) -> int:
+        """Update several system settings in one transaction using SQLAlchemy"""
+        with get_db_session() as session:
+            repo = SettingsRepository(session)
+            count = repo.update_settings(settings, user_id)
+        for setting_key in settings:
+            self._settings_cache.pop(setting_key, None)
+        return count
+    
+    def toggle_system_setting(self, setting_key: str, user_id: Optional[int] = None) -> str:
+        """Flip a '1'/'0' system setting and return the new value using SQLAlchemy"""
         with get_db_session() as session:
             repo = SettingsRepository(session)
-            return repo.get_int_setting(setting_key, default)
+            new_value = '0' if repo.get_setting(setting_key) == '1' else '1'
+            repo.update_setting(setting_key, new_value, user_id)
+        self._settings_cache.pop(setting_key, None)
+        return new_value
+
+    def get_int_setting(self, setting_key: str, default: int) -> int:
+        """Get an integer system setting with fallback"""
+        value = self.get_system_setting(setting_key)
+        if value is None:
+            return default
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            return default
 
     def get_constraint_settings(self) -> Dict[str, Any]:
         """Return parsed constraint settings for the scheduling system using SQLAlchemy"""
@@ -1168,26 +1392,22 @@ class DatabaseManager:
     
     # Updated get functions to filter by active status
     def get_hativot_active_only(self) -> List[Dict]:
-        """Get only active divisions using SQLAlchemy"""
-        with get_db_session() as session:
-            repo = HativaRepository(session)
-            hativot = repo.get_active_only()
-            return [{'hativa_id': h.hativa_id, 'name': h.name, 'description': h.description,
-                    'color': h.color, 'is_active': h.is_active, 'created_at': h.created_at} for h in hativot]
+        """Get only active divisions (cached until reference data changes)"""
+        return [h for h in self.get_hativot() if h['is_active']]
     
-    def get_maslulim_active_only(self, hativa_id: Optional[int] = None) -> List[Dict]:
-        """Get only active routes using SQLAlchemy"""
+    def maslul_name_exists(self, hativa_id: int, name: str) -> bool:
+        """Check whether a route name already exists in a division using SQLAlchemy"""
         with get_db_session() as session:
             repo = MaslulRepository(session)
-            maslulim = repo.get_active_only(hativa_id=hativa_id)
-            return [m.to_dict() for m in maslulim]
+            return repo.name_exists(hativa_id, name)
+    
+    def get_maslulim_active_only(self, hativa_id: Optional[int] = None) -> List[Dict]:
+        """Get only active routes (cached until reference data changes)"""
+        return [m for m in self.get_maslulim(hativa_id) if m['is_active']]
     
     def get_committee_types_active_only(self, hativa_id: Optional[int] = None) -> List[Dict]:
-        """Get only active committee types using SQLAlchemy"""
-        with get_db_session() as session:
-            repo = CommitteeTypeRepository(session)
-            cts = repo.get_active_only(hativa_id=hativa_id)
-            return [ct.to_dict() for ct in cts]
+        """Get only active committee types (cached until reference data changes)"""
+        return [ct for ct in self.get_committee_types(hativa_id) if ct['is_active']]
     
     # Enhanced Business Days and SLA Calculations
     def get_work_days(self) -> List[int]:
@@ -1209,23 +1429,32 @@ class DatabaseManager:
             repo = VaadaRepository(session)
             return repo.count_in_range(start_date, end_date, is_operational=False)
     
+    def _exception_date_set(self) -> frozenset:
+        """All exception dates (past included), cached like the other reference rows"""
+        def load():
+            with get_db_session() as session:
+                repo = ExceptionDateRepository(session)
+                return frozenset(item.exception_date for item in repo.get_exception_dates(include_past=True))
+        return self._ref_rows(('exception_date_set',), load)
+
+    def _work_day_checker(self):
+        """Return a date -> bool work-day predicate with settings and exception dates resolved once"""
+        work_days = frozenset(self.get_work_days())
+        exception_dates = self._exception_date_set()
+        return lambda d: d.weekday() in work_days and d not in exception_dates
+
     def is_work_day(self, check_date: date) -> bool:
         """Check if date is a work day (not weekend, not holiday, configured work days)"""
-        # Check if it's a configured work day
-        work_days = self.get_work_days()
-        if check_date.weekday() not in work_days:
-            return False
-        
-        # Check if it's an exception date (holiday, special sabbath, etc.)
-        return not self.is_exception_date(check_date)
+        return self._work_day_checker()(check_date)
     
     def get_business_days_in_range(self, start_date: date, end_date: date) -> List[date]:
         """Get all business days in a date range"""
+        is_work_day = self._work_day_checker()
         business_days = []
         current_date = start_date
         
         while current_date <= end_date:
-            if self.is_work_day(current_date):
+            if is_work_day(current_date):
                 business_days.append(current_date)
             current_date += timedelta(days=1)
         
@@ -1233,24 +1462,26 @@ class DatabaseManager:
     
     def add_business_days(self, start_date: date, days_to_add: int) -> date:
         """Add business days to a date (skipping weekends and holidays)"""
+        is_work_day = self._work_day_checker()
         current_date = start_date
         days_added = 0
         
         while days_added < days_to_add:
             current_date += timedelta(days=1)
-            if self.is_work_day(current_date):
+            if is_work_day(current_date):
                 days_added += 1
         
         return current_date
     
     def subtract_business_days(self, start_date: date, days_to_subtract: int) -> date:
         """Subtract business days from a date (skipping weekends and holidays)"""
+        is_work_day = self._work_day_checker()
         current_date = start_date
         days_subtracted = 0
         
         while days_subtracted < days_to_subtract:
             current_date -= timedelta(days=1)
-            if self.is_work_day(current_date):
+            if is_work_day(current_date):
                 days_subtracted += 1
         
         return current_date
@@ -1294,7 +1525,6 @@ class DatabaseManager:
         
         # המר את תאריך הועדה לאובייקט date אם הוא מחרוזת
         if isinstance(committee_date, str):
-            from datetime import datetime
             committee_date = datetime.strptime(committee_date, '%Y-%m-%d').date()
         
         # חישוב התאריכים אחורה מתאריך הועדה
@@ -1340,25 +1570,47 @@ class DatabaseManager:
         
         return sla_dates
     
+    @staticmethod
+    def _event_to_extended_dict(e) -> Dict:
+        """Convert an event to a dict with the extended keys used by listing views"""
+        d = e.to_dict()
+        # Manual corrections for backward compatibility with specific keys
+        d['maslul_hativa_id'] = e.maslul.hativa_id if e.maslul else None
+        d['sla_days'] = e.maslul.sla_days if e.maslul else 45
+        d['committee_type_id'] = e.vaada.committee_type_id if e.vaada else None
+        return d
+    
+    def get_events_page(self, limit: int, offset: int = 0, descending: bool = False) -> List[Dict]:
+        """Get one page of active events ordered by committee date using SQLAlchemy"""
+        with get_db_session() as session:
+            repo = EventRepository(session)
+            events = repo.get_page(limit, offset, descending)
+            return [self._event_to_extended_dict(e) for e in events]
+    
+    def count_active_events(self) -> int:
+        """Count active events using SQLAlchemy"""
+        with get_db_session() as session:
+            repo = EventRepository(session)
+            return repo.count_active()
+    
     def get_all_events(self, include_deleted: bool = False) -> List[Dict]:
         """Get all events using SQLAlchemy with extended information"""
         with get_db_session() as session:
             repo = EventRepository(session)
             events = repo.get_all(include_deleted=include_deleted)
             
-            result = []
-            for e in events:
-                d = e.to_dict()
-                # Manual corrections for backward compatibility with specific keys
-                d['maslul_hativa_id'] = e.maslul.hativa_id if e.maslul else None
-                d['sla_days'] = e.maslul.sla_days if e.maslul else 45
-                d['committee_type_id'] = e.vaada.committee_type_id if e.vaada else None
-                result.append(d)
+            result = [self._event_to_extended_dict(e) for e in events]
             
             # Sort as in original SQL: ORDER BY v.vaada_date DESC, e.created_at DESC
             result.sort(key=lambda x: (str(x.get('vaada_date') or ''), str(x.get('created_at') or '')), reverse=True)
             return result
 
+    def get_distinct_event_types(self) -> List[str]:
+        """Get distinct event types of active events using SQLAlchemy"""
+        with get_db_session() as session:
+            repo = EventRepository(session)
+            return repo.get_distinct_event_types()
+
     def get_event_by_id(self, event_id: int) -> Optional[Dict]:
         """Get event by ID using SQLAlchemy"""
         with get_db_session() as session:
@@ -1371,6 +1623,12 @@ class DatabaseManager:
                 return d
             return None
     
+    def get_move_event_context(self, event_id: int, target_vaada_id: int) -> Optional[Dict]:
+        """Get event, route and committee details for a drag-and-drop move in one query"""
+        with get_db_session() as session:
+            repo = EventRepository(session)
+            return repo.get_move_context(event_id, target_vaada_id)
+    
     def get_vaada_by_id(self, vaada_id: int) -> Optional[Dict]:
         """Get committee meeting by ID using SQLAlchemy"""
         with get_db_session() as session:
@@ -1404,7 +1662,8 @@ class DatabaseManager:
                      entity_type: str, entity_id: Optional[int] = None, 
                      entity_name: Optional[str] = None, details: Optional[str] = None,
                      ip_address: Optional[str] = None, user_agent: Optional[str] = None,
-                     status: str = 'success', error_message: Optional[str] = None) -> int:
+                     status: str = 'success', error_message: Optional[str] = None,
+                     timestamp: Optional[datetime] = None) -> int:
         """Add an audit log entry using SQLAlchemy"""
         with get_db_session() as session:
             repo = AuditLogRepository(session)
@@ -1413,13 +1672,22 @@ class DatabaseManager:
                 entity_type=entity_type, entity_id=entity_id, 
                 entity_name=entity_name, details=details,
                 ip_address=ip_address, user_agent=user_agent,
-                status=status, error_message=error_message
+                status=status, error_message=error_message,
+                timestamp=timestamp
             )
     
+    def add_audit_logs(self, entries: List[Dict]) -> int:
+        """Add several audit log entries in one INSERT and transaction using SQLAlchemy"""
+        with get_db_session() as session:
+            repo = AuditLogRepository(session)
+            return repo.log_many(entries)
+    
     def get_audit_logs(self, limit: int = 100, offset: int = 0,
                        user_id: Optional[int] = None,
+                       username: Optional[str] = None,
                        entity_type: Optional[str] = None,
                        action: Optional[str] = None,
+                       status: Optional[str] = None,
                        search_text: Optional[str] = None,
                        start_date: Optional[date] = None,
                        end_date: Optional[date] = None) -> List[Dict]:
@@ -1427,15 +1695,28 @@ class DatabaseManager:
         with get_db_session() as session:
             repo = AuditLogRepository(session)
             logs = repo.get_logs(
-                limit=limit, offset=offset, user_id=user_id,
-                entity_type=entity_type, action=action,
+                limit=limit, offset=offset, user_id=user_id, username=username,
+                entity_type=entity_type, action=action, status=status,
                 search_text=search_text, start_date=start_date, end_date=end_date
             )
             return [log.to_dict() for log in logs]
     
+    def iter_audit_log_rows(self, columns: List[str], batch_size: int = 1000,
+                            **filters) -> Iterator[List[Tuple]]:
+        """Stream batches of audit log column tuples matching the get_audit_logs filters using SQLAlchemy"""
+        with get_db_session() as session:
+            if session.get_bind().dialect.name == 'postgresql':
+                # The cursor's transaction idles while the client downloads each batch; lift the
+                # engine-wide idle_in_transaction_session_timeout for this transaction only
+                session.execute(text('SET LOCAL idle_in_transaction_session_timeout = 0'))
+            repo = AuditLogRepository(session)
+            yield from repo.iter_log_rows(columns, batch_size=batch_size, **filters)
+    
     def get_audit_logs_count(self, user_id: Optional[int] = None,
+                             username: Optional[str] = None,
                              entity_type: Optional[str] = None,
                              action: Optional[str] = None,
+                             status: Optional[str] = None,
                              search_text: Optional[str] = None,
                              start_date: Optional[date] = None,
                              end_date: Optional[date] = None) -> int:
@@ -1443,8 +1724,8 @@ class DatabaseManager:
         with get_db_session() as session:
             repo = AuditLogRepository(session)
             return repo.get_logs_count(
-                user_id=user_id, entity_type=entity_type, action=action,
-                search_text=search_text, start_date=start_date, end_date=end_date
+                user_id=user_id, username=username, entity_type=entity_type, action=action,
+                status=status, search_text=search_text, start_date=start_date, end_date=end_date
             )
     
     def get_audit_statistics(self) -> Dict:
@@ -1456,48 +1737,85 @@ class DatabaseManager:
     def update_event_vaada(self, event_id: int, new_vaada_id: int, user_role: Optional[str] = None) -> bool:
         """Update event's committee meeting using SQLAlchemy with constraint validation"""
         with get_db_session() as session:
-            event_repo = EventRepository(session)
-            vaada_repo = VaadaRepository(session)
-            settings_repo = SettingsRepository(session)
-            exception_repo = ExceptionDateRepository(session)
-            
-            # 1. Fetch Event and Target Vaada
-            event = event_repo.get_by_id(event_id)
-            target_vaada = vaada_repo.get_by_id(new_vaada_id)
-            
-            if not event or not target_vaada:
-                raise ValueError("האירוע או הועדה לא נמצאו במערכת")
-                
-            # 2. Check max requests constraint for target committee date (excluding this event, skip for admins)
-            if user_role != 'admin':
-                max_req = settings_repo.get_int_setting('max_requests_committee_date', 100)
-                current_total = event_repo.get_total_requests_on_date(target_vaada.vaada_date, exclude_event_id=event_id)
-                if current_total + event.expected_requests > max_req:
-                    raise ValueError(f'חריגה מאילוץ מקסימום בקשות ביום ועדה: התאריך {target_vaada.vaada_date} כבר מכיל {current_total} בקשות צפויות. העברת אירוע זה עם {event.expected_requests} בקשות תגרום לסך של {current_total + event.expected_requests} (המגבלה היא {max_req})')
-            
-            # 3. Calculate derived dates for the target committee
-            work_days = settings_repo.get_work_days()
-            maslul = event.maslul
-            stage_dates = event_repo.calculate_stage_dates(
-                target_vaada.vaada_date,
-                maslul.stage_a_days, maslul.stage_b_days, maslul.stage_c_days, maslul.stage_d_days,
-                lambda d: exception_repo.is_work_day(d, work_days)
-            )
-            
-            # 4. Check derived constraints
-            derived_error = event_repo.check_derived_dates_constraints(stage_dates, event.expected_requests, exclude_event_id=event_id, user_role=user_role)
-            if derived_error:
-                raise ValueError(derived_error)
-            
-            # 5. Apply Update
-            event.vaadot_id = new_vaada_id
-            event.call_deadline_date = stage_dates['call_deadline_date']
-            event.intake_deadline_date = stage_dates['intake_deadline_date']
-            event.review_deadline_date = stage_dates['review_deadline_date']
-            event.response_deadline_date = stage_dates['response_deadline_date']
+            return self._apply_event_vaada(session, event_id, new_vaada_id, user_role)
+
+    def _apply_event_vaada(self, session, event_id: int, new_vaada_id: int, user_role: Optional[str] = None) -> bool:
+        """Validate and apply an event's committee change inside an open session"""
+        event_repo = EventRepository(session)
+        vaada_repo = VaadaRepository(session)
+        settings_repo = SettingsRepository(session)
+        exception_repo = ExceptionDateRepository(session)
+        
+        # 1. Fetch Event and Target Vaada
+        event = event_repo.get_by_id(event_id)
+        target_vaada = vaada_repo.get_by_id(new_vaada_id)
+        
+        if not event or not target_vaada:
+            raise ValueError("האירוע או הועדה לא נמצאו במערכת")
             
-            session.flush()
-            return True
+        # 2. Check max requests constraint for target committee date (excluding this event, skip for admins)
+        if user_role != 'admin':
+            max_req = settings_repo.get_int_setting('max_requests_committee_date', 100)
+            current_total = event_repo.get_total_requests_on_date(target_vaada.vaada_date, exclude_event_id=event_id)
+            if current_total + event.expected_requests > max_req:
+                raise ValueError(f'חריגה מאילוץ מקסימום בקשות ביום ועדה: התאריך {target_vaada.vaada_date} כבר מכיל {current_total} בקשות צפויות. העברת אירוע זה עם {event.expected_requests} בקשות תגרום לסך של {current_total + event.expected_requests} (המגבלה היא {max_req})')
+        
+        # 3. Calculate derived dates for the target committee
+        work_days = settings_repo.get_work_days()
+        maslul = event.maslul
+        stage_dates = event_repo.calculate_stage_dates(
+            target_vaada.vaada_date,
+            maslul.stage_a_days, maslul.stage_b_days, maslul.stage_c_days, maslul.stage_d_days,
+            exception_repo.work_day_checker(work_days)
+        )
+        
+        # 4. Check derived constraints
+        derived_error = event_repo.check_derived_dates_constraints(stage_dates, event.expected_requests, exclude_event_id=event_id, user_role=user_role)
+        if derived_error:
+            raise ValueError(derived_error)
+        
+        # 5. Apply Update
+        event.vaadot_id = new_vaada_id
+        event.call_deadline_date = stage_dates['call_deadline_date']
+        event.intake_deadline_date = stage_dates['intake_deadline_date']
+        event.review_deadline_date = stage_dates['review_deadline_date']
+        event.response_deadline_date = stage_dates['response_deadline_date']
+        
+        session.flush()
+        return True
+
+    def apply_moves_batch(self, moves: List[Dict], user_role: Optional[str] = None) -> List[Dict]:
+        """
+        Apply committee/event moves in a single transaction using SQLAlchemy.
+        Each move runs in its own savepoint so a rejected move doesn't undo the others.
+        Moves are {'kind': 'committee', 'vaada_id', 'new_date'} or {'kind': 'event', 'event_id', 'target_vaada_id'}.
+        Returns one {'success', 'message'} dict per move, in order.
+        """
+        results = []
+        with get_db_session() as session:
+            for move in moves:
+                savepoint = session.begin_nested()
+                try:
+                    if move['kind'] == 'committee':
+                        success = self._apply_vaada_date(session, move['vaada_id'], move['new_date'], user_role=user_role)
+                    else:
+                        success = self._apply_event_vaada(session, move['event_id'], move['target_vaada_id'], user_role)
+                except ValueError as e:
+                    savepoint.rollback()
+                    results.append({'success': False, 'message': str(e)})
+                    continue
+                except Exception as e:
+                    logger.exception("Error applying batched move %s", move)
+                    savepoint.rollback()
+                    results.append({'success': False, 'message': f'שגיאה: {str(e)}'})
+                    continue
+                if success:
+                    savepoint.commit()
+                    results.append({'success': True, 'message': ''})
+                else:
+                    savepoint.rollback()
+                    results.append({'success': False, 'message': 'שגיאה בעדכון מסד נתונים'})
+        return results
     
     # Active Directory User Management Methods
     def create_ad_user(self, username: str, email: str, full_name: str, 
@@ -1560,6 +1878,12 @@ class DatabaseManager:
                 return d
             return None
     
+    def count_ad_users(self) -> int:
+        """Count Active Directory users using SQLAlchemy"""
+        with get_db_session() as session:
+            repo = UserRepository(session)
+            return repo.count_ad_users()
+    
     def get_ad_users(self) -> List[Dict]:
         """Get all Active Directory users using SQLAlchemy"""
         with get_db_session() as session:
@@ -1583,6 +1907,20 @@ class DatabaseManager:
             events = repo.get_deleted(hativa_id=hativa_id)
             return [e.to_dict() for e in events]
     
+    def get_deleted_vaada(self, vaadot_id: int) -> Optional[Dict]:
+        """Get a single deleted committee meeting by primary key using SQLAlchemy"""
+        with get_db_session() as session:
+            repo = VaadaRepository(session)
+            vaada = repo.get_by_id(vaadot_id)
+            return vaada.to_dict() if vaada and vaada.is_deleted == 1 else None
+    
+    def get_deleted_event(self, event_id: int) -> Optional[Dict]:
+        """Get a single deleted event by primary key using SQLAlchemy"""
+        with get_db_session() as session:
+            repo = EventRepository(session)
+            event = repo.get_by_id(event_id)
+            return self._event_to_extended_dict(event) if event and event.is_deleted == 1 else None
+    
     def restore_vaada(self, vaadot_id: int) -> bool:
         """Restore a deleted committee meeting using SQLAlchemy"""
         with get_db_session() as session:
@@ -8,12 +8,16 @@ and utility functions for both PostgreSQL and SQLite.
 """
 
 import os
+import threading
+import time
 from contextlib import contextmanager
+from itertools import chain
 from typing import Generator
 
 from sqlalchemy import create_engine, event, text
-from sqlalchemy.orm import sessionmaker, Session, scoped_session
+from sqlalchemy.orm import sessionmaker, Session, scoped_session, ORMExecuteState
 from sqlalchemy.pool import QueuePool, StaticPool
+from sqlalchemy.schema import CreateIndex
 
 from models import Base
 
@@ -47,15 +51,22 @@ def create_database_engine(database_url: str = None):
     if database_url is None:
         database_url = get_database_url()
     
+    connect_args = {}
+    if database_url.startswith('postgresql'):
+        # Let the server end transactions left open by a crashed or stuck worker
+        connect_args['options'] = '-c idle_in_transaction_session_timeout=60000'
+    
     # PostgreSQL configuration with connection pooling
     engine = create_engine(
         database_url,
         poolclass=QueuePool,
-        pool_size=5,
-        max_overflow=10,
-        pool_timeout=30,
+        pool_size=int(os.environ.get('DB_POOL_SIZE', '10')),
+        max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', '20')),
+        pool_timeout=int(os.environ.get('DB_POOL_TIMEOUT', '5')),
         pool_recycle=1800,  # Recycle connections after 30 minutes
         pool_pre_ping=True,  # Enable connection health checks
+        pool_use_lifo=True,  # Reuse the most recent connection so surplus ones go idle and get recycled
+        connect_args=connect_args,
         echo=False  # Set to True for SQL debugging
     )
     
@@ -210,6 +221,34 @@ def init_database():
     db.create_all_tables()
 
 
+# Indexes added to tables that already existed in deployed databases. create_all only
+# builds indexes together with a new table, so ensure_indexes() creates these in place.
+POST_DEPLOY_INDEXES = {
+    'audit_logs': ('idx_audit_logs_user_timestamp', 'idx_audit_logs_entity_action_timestamp',
+                   'idx_audit_logs_status_timestamp'),
+    'maslulim': ('idx_maslulim_hativa_lname',),
+    'events': ('idx_events_maslul_id', 'idx_events_vaadot_id'),
+}
+
+# Indexes superseded by one of the above
+DROPPED_INDEXES = ('idx_audit_logs_user',)
+
+
+def ensure_indexes():
+    """
+    Create POST_DEPLOY_INDEXES and drop DROPPED_INDEXES on an existing database.
+    Safe to call multiple times - existing indexes are skipped.
+    """
+    # IF NOT EXISTS rather than checkfirst: reflection cannot see expression indexes on SQLite
+    with db.engine.begin() as conn:
+        for table_name, index_names in POST_DEPLOY_INDEXES.items():
+            indexes = {index.name: index for index in Base.metadata.tables[table_name].indexes}
+            for name in index_names:
+                conn.execute(CreateIndex(indexes[name], if_not_exists=True))
+        for name in DROPPED_INDEXES:
+            conn.execute(text(f'DROP INDEX IF EXISTS {name}'))
+
+
 def execute_raw_sql(sql: str, params: dict = None) -> list:
     """
     Execute raw SQL for cases where ORM isn't suitable.
@@ -226,6 +265,69 @@ def execute_raw_sql(sql: str, params: dict = None) -> list:
         return result.fetchall()
 
 
+# Reference data versioning
+# Tables whose changes invalidate cached/conditional API responses.
+REF_DATA_TABLES = frozenset({
+    'hativot', 'hativa_day_constraints', 'maslulim', 'committee_types',
+    'vaadot', 'events', 'exception_dates',
+})
+
+# The epoch makes tokens from a previous process never match the current one.
+_ref_data_epoch = int(time.time())
+_ref_data_counter = 0
+_ref_data_lock = threading.Lock()
+
+
+def get_ref_data_version() -> str:
+    """
+    Get a cheap token identifying the current state of the reference data.
+    The token changes after every committed transaction that touched one of
+    REF_DATA_TABLES, so it can back ETags and response caches.
+    """
+    return f"{_ref_data_epoch}.{_ref_data_counter}"
+
+
+def bump_ref_data_version():
+    """Invalidate the current reference data version."""
+    global _ref_data_counter
+    with _ref_data_lock:
+        _ref_data_counter += 1
+
+
+def _is_ref_data_table(table_name: str) -> bool:
+    return table_name in REF_DATA_TABLES
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_ref_data_flush(session, flush_context):
+    """Mark the session when a flush writes reference data rows."""
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if _is_ref_data_table(getattr(obj, '__tablename__', None)):
+            session.info['ref_data_changed'] = True
+            return
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_ref_data_bulk(orm_execute_state: ORMExecuteState):
+    """Mark the session for bulk UPDATE/DELETE statements on reference data."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and _is_ref_data_table(mapper.local_table.name):
+        orm_execute_state.session.info['ref_data_changed'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_ref_data_changes(session):
+    if session.info.pop('ref_data_changed', False):
+        bump_ref_data_version()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_ref_data_changes(session):
+    session.info.pop('ref_data_changed', None)
+
+
 # Convenience exports
 __all__ = [
     'db',
@@ -234,6 +336,8 @@ __all__ = [
     'get_db_session',
     'init_database',
     'execute_raw_sql',
+    'get_ref_data_version',
+    'bump_ref_data_version',
     'DatabaseSession',
     'create_database_engine',
     'get_database_url',
@@ -13,7 +13,7 @@ from typing import List, Optional, TYPE_CHECKING
 from sqlalchemy import (
     Column, Integer, String, Text, Date, Time, DateTime, 
     ForeignKey, CheckConstraint, UniqueConstraint, Index,
-    LargeBinary, Boolean, func
+    LargeBinary, Boolean, func, text
 )
 from sqlalchemy.orm import (
     DeclarativeBase, Mapped, mapped_column, relationship
@@ -136,6 +136,10 @@ class Maslul(Base):
     hativa: Mapped["Hativa"] = relationship("Hativa", back_populates="maslulim")
     events: Mapped[List["Event"]] = relationship("Event", back_populates="maslul", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        Index('idx_maslulim_hativa_lname', 'hativa_id', text('lower(name)')),
+    )
+    
     def to_dict(self) -> dict:
         """Convert model to dictionary for backward compatibility."""
         return {
@@ -309,6 +313,8 @@ class Event(Base):
     
     __table_args__ = (
         CheckConstraint("event_type IN ('kokok', 'shotef')", name='ck_event_type'),
+        Index('idx_events_maslul_id', 'maslul_id'),
+        Index('idx_events_vaadot_id', 'vaadot_id'),
     )
     
     def to_dict(self) -> dict:
@@ -440,8 +446,10 @@ class AuditLog(Base):
     
     __table_args__ = (
         Index('idx_audit_logs_timestamp', 'timestamp'),
-        Index('idx_audit_logs_user', 'user_id'),
+        Index('idx_audit_logs_user_timestamp', 'user_id', 'timestamp'),
         Index('idx_audit_logs_entity', 'entity_type', 'entity_id'),
+        Index('idx_audit_logs_entity_action_timestamp', 'entity_type', 'action', 'timestamp'),
+        Index('idx_audit_logs_status_timestamp', 'status', 'timestamp'),
     )
     
     def to_dict(self) -> dict:
@@ -4,13 +4,13 @@
 Audit Log repository for database operations.
 """
 
-from typing import List, Optional, Dict, Any
-from datetime import date, datetime
-from sqlalchemy import select, func, and_, or_
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import select, insert, func, or_
 from sqlalchemy.orm import Session
 
 from .base import BaseRepository
-from models import AuditLog
+from models import AuditLog, User
 
 
 class AuditLogRepository(BaseRepository[AuditLog]):
@@ -22,10 +22,14 @@ class AuditLogRepository(BaseRepository[AuditLog]):
             entity_type: str, entity_id: Optional[int] = None, 
             entity_name: Optional[str] = None, details: Optional[str] = None,
             ip_address: Optional[str] = None, user_agent: Optional[str] = None,
-            status: str = 'success', error_message: Optional[str] = None) -> int:
+            status: str = 'success', error_message: Optional[str] = None,
+            timestamp: Optional[datetime] = None) -> int:
         """
         Create a new audit log entry.
         
+        Args:
+            timestamp: When the action happened (defaults to the database's now())
+        
         Returns:
             Log ID
         """
@@ -42,26 +46,92 @@ class AuditLogRepository(BaseRepository[AuditLog]):
             status=status,
             error_message=error_message
         )
+        if timestamp is not None:
+            log_entry.timestamp = timestamp
         self.add(log_entry)
         return log_entry.log_id
     
+    def log_many(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Create several audit log entries with a single executemany INSERT.
+        
+        Args:
+            entries: Dicts of AuditLog column values, all with the same keys
+            
+        Returns:
+            Number of entries written
+        """
+        if not entries:
+            return 0
+        self.session.execute(insert(AuditLog), entries)
+        return len(entries)
+    
     def get_logs(self, limit: int = 100, offset: int = 0,
                  user_id: Optional[int] = None,
+                 username: Optional[str] = None,
                  entity_type: Optional[str] = None,
                  action: Optional[str] = None,
+                 status: Optional[str] = None,
                  search_text: Optional[str] = None,
                  start_date: Optional[date] = None,
                  end_date: Optional[date] = None) -> List[AuditLog]:
         """Get audit logs with optional filters."""
-        stmt = select(AuditLog)
+        stmt = self._logs_stmt(user_id=user_id, username=username, entity_type=entity_type,
+                               action=action, status=status, search_text=search_text,
+                               start_date=start_date, end_date=end_date)
+        stmt = stmt.limit(limit).offset(offset)
         
+        result = self.session.execute(stmt)
+        return list(result.scalars().all())
+    
+    def iter_log_rows(self, columns: List[str], batch_size: int = 1000,
+                      **filters) -> Iterator[List[Tuple]]:
+        """
+        Stream selected columns of matching audit logs (newest first) in batches.
+        
+        Plain column tuples are fetched instead of AuditLog instances, so no ORM
+        objects are built and each batch can be handed straight to a writer.
+        
+        Args:
+            columns: AuditLog attribute names to select, in output order
+            batch_size: Rows fetched from the database per round trip
+            **filters: Same filters as get_logs
+            
+        Returns:
+            Iterator of row batches
+        """
+        stmt = (select(*(getattr(AuditLog, c) for c in columns))
+                .where(*self._log_filters(**filters))
+                .order_by(AuditLog.timestamp.desc(), AuditLog.log_id.desc())
+                .execution_options(yield_per=batch_size))
+        return self.session.execute(stmt).partitions()
+    
+    def _logs_stmt(self, **filters):
+        """Build the filtered, newest-first audit log query."""
+        return select(AuditLog).where(*self._log_filters(**filters)).order_by(AuditLog.timestamp.desc(), AuditLog.log_id.desc())
+    
+    def _log_filters(self, user_id: Optional[int] = None,
+                     username: Optional[str] = None,
+                     entity_type: Optional[str] = None,
+                     action: Optional[str] = None,
+                     status: Optional[str] = None,
+                     search_text: Optional[str] = None,
+                     start_date: Optional[date] = None,
+                     end_date: Optional[date] = None) -> list:
+        """Build the WHERE conditions shared by the audit log list and count queries."""
         filters = []
         if user_id:
             filters.append(AuditLog.user_id == user_id)
+        if username:
+            filters.append(AuditLog.user_id.in_(
+                select(User.user_id).where(User.username.ilike(f"%{username}%"))
+            ))
         if entity_type:
             filters.append(AuditLog.entity_type == entity_type)
         if action:
             filters.append(AuditLog.action == action)
+        if status:
+            filters.append(AuditLog.status == status)
         if search_text:
             pattern = f"%{search_text}%"
             filters.append(or_(
@@ -69,50 +139,27 @@ class AuditLogRepository(BaseRepository[AuditLog]):
                 AuditLog.details.ilike(pattern),
                 AuditLog.entity_type.ilike(pattern)
             ))
+        # Compare the raw timestamp against day bounds so the timestamp indexes apply
         if start_date:
-            stmt = stmt.where(func.date(AuditLog.timestamp) >= start_date)
+            filters.append(AuditLog.timestamp >= datetime.combine(start_date, time.min))
         if end_date:
-            stmt = stmt.where(func.date(AuditLog.timestamp) <= end_date)
-            
-        if filters:
-            stmt = stmt.where(and_(*filters))
-            
-        stmt = stmt.order_by(AuditLog.timestamp.desc()).limit(limit).offset(offset)
-        
-        result = self.session.execute(stmt)
-        return list(result.scalars().all())
+            filters.append(AuditLog.timestamp < datetime.combine(end_date + timedelta(days=1), time.min))
+        return filters
     
     def get_logs_count(self, user_id: Optional[int] = None,
+                       username: Optional[str] = None,
                        entity_type: Optional[str] = None,
                        action: Optional[str] = None,
+                       status: Optional[str] = None,
                        search_text: Optional[str] = None,
                        start_date: Optional[date] = None,
                        end_date: Optional[date] = None) -> int:
         """Get total count of audit logs matching filters."""
-        stmt = select(func.count()).select_from(AuditLog)
+        stmt = select(func.count()).select_from(AuditLog).where(*self._log_filters(
+            user_id=user_id, username=username, entity_type=entity_type, action=action,
+            status=status, search_text=search_text, start_date=start_date, end_date=end_date
+        ))
         
-        filters = []
-        if user_id:
-            filters.append(AuditLog.user_id == user_id)
-        if entity_type:
-            filters.append(AuditLog.entity_type == entity_type)
-        if action:
-            filters.append(AuditLog.action == action)
-        if search_text:
-            pattern = f"%{search_text}%"
-            filters.append(or_(
-                AuditLog.entity_name.ilike(pattern),
-                AuditLog.details.ilike(pattern),
-                AuditLog.entity_type.ilike(pattern)
-            ))
-        if start_date:
-            stmt = stmt.where(func.date(AuditLog.timestamp) >= start_date)
-        if end_date:
-            stmt = stmt.where(func.date(AuditLog.timestamp) <= end_date)
-            
-        if filters:
-            stmt = stmt.where(and_(*filters))
-            
         result = self.session.execute(stmt)
         return result.scalar()
     
@@ -134,7 +181,6 @@ class AuditLogRepository(BaseRepository[AuditLog]):
         # Recent activity (last 24 hours) - Generic approach for both SQLite and PG
         # In SQLAlchemy, we can use func.now() and compare with interval
         # But interval is dialect specific. A safer way is to use python to get the cutoff.
-        from datetime import timedelta
         cutoff = datetime.now() - timedelta(days=1)
         recent_stmt = select(func.count(AuditLog.log_id)).where(AuditLog.timestamp >= cutoff)
         last_24h = self.session.execute(recent_stmt).scalar()
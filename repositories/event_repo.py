@@ -4,10 +4,10 @@
 Event repository for database operations.
 """
 
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from typing import List, Optional, Dict, Any
-from sqlalchemy import select, and_, or_, func
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select, update, and_, or_, func
+from sqlalchemy.orm import joinedload, selectinload, raiseload, aliased
 
 from .base import BaseRepository
 from models import Event, Vaada, Maslul, CommitteeType, Hativa
@@ -30,24 +30,185 @@ class EventRepository(BaseRepository[Event]):
         Returns:
             List of Event instances
         """
+        # Load exactly what Event.to_dict() reads with one IN query per relationship;
+        # raiseload('*') turns any other lazy load into an error instead of a hidden N+1
         stmt = select(Event).options(
-            joinedload(Event.vaada).joinedload(Vaada.committee_type).joinedload(CommitteeType.hativa),
-            joinedload(Event.vaada).joinedload(Vaada.hativa),
-            joinedload(Event.maslul).joinedload(Maslul.hativa)
+            selectinload(Event.vaada).options(
+                selectinload(Vaada.committee_type),
+                selectinload(Vaada.hativa)
+            ),
+            selectinload(Event.maslul),
+            raiseload('*')
         ).order_by(Event.event_id)
         
         if vaadot_id is not None:
             stmt = stmt.where(Event.vaadot_id == vaadot_id)
         
         if not include_deleted:
-            stmt = stmt.where(and_(
+            # Explicit join so the committee filter applies to each event's own committee
+            stmt = stmt.join(Event.vaada).where(and_(
                 or_(Event.is_deleted == 0, Event.is_deleted.is_(None)),
                 or_(Vaada.is_deleted == 0, Vaada.is_deleted.is_(None))
             ))
         
+        result = self.session.execute(stmt)
+        return list(result.scalars().all())
+    
+    def get_page(self, limit: int, offset: int = 0, descending: bool = False) -> List[Event]:
+        """
+        Get one page of active events ordered by committee date.
+        
+        Args:
+            limit: Maximum number of events to return
+            offset: Number of events to skip
+            descending: If True, newest committee dates come first
+            
+        Returns:
+            List of Event instances
+        """
+        date_order = Vaada.vaada_date.desc() if descending else Vaada.vaada_date.asc()
+        stmt = select(Event).join(Event.vaada).options(
+            joinedload(Event.vaada).joinedload(Vaada.committee_type).joinedload(CommitteeType.hativa),
+            joinedload(Event.vaada).joinedload(Vaada.hativa),
+            joinedload(Event.maslul).joinedload(Maslul.hativa)
+        ).where(
+            or_(Event.is_deleted == 0, Event.is_deleted.is_(None)),
+            or_(Vaada.is_deleted == 0, Vaada.is_deleted.is_(None))
+        ).order_by(date_order, Event.event_id).limit(limit).offset(offset)
+        
         result = self.session.execute(stmt)
         return list(result.unique().scalars().all())
     
+    def count_active(self) -> int:
+        """
+        Count active events (event and committee meeting not deleted).
+        
+        Returns:
+            Number of active events
+        """
+        stmt = select(func.count()).select_from(Event).join(Event.vaada).where(
+            or_(Event.is_deleted == 0, Event.is_deleted.is_(None)),
+            or_(Vaada.is_deleted == 0, Vaada.is_deleted.is_(None))
+        )
+        return self.session.execute(stmt).scalar() or 0
+    
+    def get_active_by_ids(self, event_ids: List[int]) -> List[Event]:
+        """
+        Get active events with the given IDs, with their route loaded.
+        
+        Args:
+            event_ids: Event IDs to fetch
+            
+        Returns:
+            List of Event instances (unknown or deleted IDs are skipped)
+        """
+        stmt = select(Event).options(selectinload(Event.maslul)).where(
+            Event.event_id.in_(event_ids),
+            or_(Event.is_deleted == 0, Event.is_deleted.is_(None))
+        )
+        return list(self.session.execute(stmt).scalars().all())
+    
+    def get_names_outside_hativot(self, event_ids: List[int], hativa_ids: List[int],
+                                  limit: Optional[int] = None) -> List[str]:
+        """
+        Get names of active events whose route is not in any of the given divisions.
+        
+        Args:
+            event_ids: Event IDs to check
+            hativa_ids: Allowed division IDs
+            limit: Maximum number of names to return
+            
+        Returns:
+            List of event names (empty when all events are within the divisions)
+        """
+        stmt = select(Event.name).join(Event.maslul).where(
+            Event.event_id.in_(event_ids),
+            or_(Event.is_deleted == 0, Event.is_deleted.is_(None)),
+            Maslul.hativa_id.not_in(hativa_ids)
+        ).order_by(Event.event_id).limit(limit)
+        return list(self.session.execute(stmt).scalars().all())
+    
+    def bulk_soft_delete(self, event_ids: List[int], user_id: Optional[int] = None) -> int:
+        """
+        Soft delete several events with a single UPDATE.
+        
+        Args:
+            event_ids: Event IDs to delete
+            user_id: User performing the delete
+            
+        Returns:
+            Number of events deleted (already-deleted events are not counted)
+        """
+        stmt = update(Event).where(
+            Event.event_id.in_(event_ids),
+            or_(Event.is_deleted == 0, Event.is_deleted.is_(None))
+        ).values(
+            is_deleted=1,
+            deleted_at=datetime.now(),
+            deleted_by=user_id
+        ).execution_options(synchronize_session=False)
+        return self.session.execute(stmt).rowcount
+    
+    def bulk_soft_delete_by_vaada(self, vaadot_id: int, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Soft delete all active events of a committee meeting with a single UPDATE.
+        
+        Args:
+            vaadot_id: Committee meeting ID
+            user_id: User performing the delete
+            
+        Returns:
+            List of dicts with event_id and name of the deleted events
+        """
+        active = or_(Event.is_deleted == 0, Event.is_deleted.is_(None))
+        rows = self.session.execute(
+            select(Event.event_id, Event.name).where(Event.vaadot_id == vaadot_id, active)
+        ).all()
+        if rows:
+            self.session.execute(
+                update(Event).where(Event.vaadot_id == vaadot_id, active).values(
+                    is_deleted=1,
+                    deleted_at=datetime.now(),
+                    deleted_by=user_id
+                ).execution_options(synchronize_session=False)
+            )
+        return [{'event_id': row.event_id, 'name': row.name} for row in rows]
+    
+    def count_by_maslul(self, maslul_id: int, include_deleted: bool = True) -> int:
+        """
+        Count events using a specific route.
+        
+        Args:
+            maslul_id: Route ID
+            include_deleted: If True, include soft-deleted events and events of deleted committees
+            
+        Returns:
+            Number of events
+        """
+        stmt = select(func.count()).select_from(Event).where(Event.maslul_id == maslul_id)
+        if not include_deleted:
+            stmt = stmt.join(Event.vaada).where(
+                or_(Event.is_deleted == 0, Event.is_deleted.is_(None)),
+                or_(Vaada.is_deleted == 0, Vaada.is_deleted.is_(None))
+            )
+        return self.session.execute(stmt).scalar() or 0
+    
+    def get_name_and_date_by_maslul(self, maslul_id: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get names and committee dates of the latest events using a route (including deleted).
+        
+        Args:
+            maslul_id: Route ID
+            limit: Maximum number of events to return
+            
+        Returns:
+            List of dicts with name and vaada_date
+        """
+        stmt = select(Event.name, Vaada.vaada_date).join(Event.vaada).where(
+            Event.maslul_id == maslul_id
+        ).order_by(Vaada.vaada_date.desc(), Event.created_at.desc()).limit(limit)
+        return [{'name': row.name, 'vaada_date': row.vaada_date} for row in self.session.execute(stmt)]
+    
     def get_by_vaada(self, vaadot_id: int, include_deleted: bool = False) -> List[Event]:
         """
         Get events for a specific committee meeting.
@@ -233,6 +394,60 @@ class EventRepository(BaseRepository[Event]):
         self.session.flush()
         return True
     
+    def get_distinct_event_types(self) -> List[str]:
+        """
+        Get the distinct event types used by active events.
+        
+        Returns:
+            List of event type values
+        """
+        stmt = select(Event.event_type).distinct().join(Event.vaada).where(
+            Event.event_type.is_not(None),
+            Event.event_type != '',
+            or_(Event.is_deleted == 0, Event.is_deleted.is_(None)),
+            or_(Vaada.is_deleted == 0, Vaada.is_deleted.is_(None))
+        )
+        return list(self.session.execute(stmt).scalars().all())
+    
+    def get_move_context(self, event_id: int, target_vaada_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Fetch everything needed to validate moving an event, in one query.
+        
+        Args:
+            event_id: Event ID
+            target_vaada_id: Target committee meeting ID
+            
+        Returns:
+            Dictionary with event, route and committee details, or None if
+            either the event or the target committee does not exist
+        """
+        source_vaada = aliased(Vaada)
+        source_type = aliased(CommitteeType)
+        target_vaada = aliased(Vaada)
+        target_type = aliased(CommitteeType)
+        
+        stmt = (
+            select(
+                Event.event_id,
+                Event.name.label('event_name'),
+                Event.vaadot_id.label('source_vaada_id'),
+                Maslul.hativa_id.label('maslul_hativa_id'),
+                source_type.name.label('source_committee_name'),
+                target_vaada.vaadot_id.label('target_vaada_id'),
+                target_vaada.hativa_id.label('target_hativa_id'),
+                target_type.name.label('target_committee_name'),
+            )
+            .join(Maslul, Maslul.maslul_id == Event.maslul_id)
+            .outerjoin(source_vaada, source_vaada.vaadot_id == Event.vaadot_id)
+            .outerjoin(source_type, source_type.committee_type_id == source_vaada.committee_type_id)
+            .join(target_vaada, target_vaada.vaadot_id == target_vaada_id)
+            .join(target_type, target_type.committee_type_id == target_vaada.committee_type_id)
+            .where(Event.event_id == event_id)
+        )
+        
+        row = self.session.execute(stmt).first()
+        return dict(row._mapping) if row else None
+    
     def get_deleted(self, hativa_id: Optional[int] = None) -> List[Event]:
         """
         Get all soft-deleted events.
@@ -328,8 +543,6 @@ class EventRepository(BaseRepository[Event]):
             stage_d_days: Days for stage D
             is_work_day_fn: Function that takes a date and returns bool
         """
-        from datetime import timedelta
-        
         def add_bus_days(start: date, days: int) -> date:
             curr = start
             added = 0
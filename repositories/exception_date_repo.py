@@ -4,7 +4,7 @@
 Exception Date repository for database operations.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 from datetime import date
 from sqlalchemy import select, and_, func
 from sqlalchemy.orm import Session
@@ -38,6 +38,13 @@ class ExceptionDateRepository(BaseRepository[ExceptionDate]):
         result = self.session.execute(stmt)
         return list(result.scalars().all())
     
+    def count_exception_dates(self, include_past: bool = False) -> int:
+        """Count exception dates, optionally including past dates."""
+        stmt = select(func.count()).select_from(ExceptionDate)
+        if not include_past:
+            stmt = stmt.where(ExceptionDate.exception_date >= date.today())
+        return self.session.execute(stmt).scalar() or 0
+    
     def get_by_date(self, check_date: date) -> Optional[ExceptionDate]:
         """Get exception date by its date."""
         stmt = select(ExceptionDate).where(ExceptionDate.exception_date == check_date)
@@ -101,6 +108,23 @@ class ExceptionDateRepository(BaseRepository[ExceptionDate]):
             return False
             
         return not self.is_exception_date(check_date)
+
+    def work_day_checker(self, work_days: Optional[List[int]] = None) -> Callable[[date], bool]:
+        """
+        Build an in-memory work day predicate for bulk date arithmetic.
+        
+        Loads all exception dates once, so each check is two set lookups
+        instead of one query per date.
+        
+        Args:
+            work_days: List of weekday integers (0-6) that are work days.
+                       If None, assumes standard Sun-Thu (6, 0, 1, 2, 3, 4) in Israel.
+        """
+        if work_days is None:
+            work_days = [6, 0, 1, 2, 3, 4]
+        work_day_set = frozenset(work_days)
+        exception_dates = frozenset(self.session.execute(select(ExceptionDate.exception_date)).scalars().all())
+        return lambda d: d.weekday() in work_day_set and d not in exception_dates
         
     def add_business_days(self, start_date: date, days_to_add: int, 
                           work_days: Optional[List[int]] = None) -> date:
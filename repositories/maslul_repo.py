@@ -5,7 +5,7 @@ Maslul (Route/Track) repository for database operations.
 """
 
 from typing import List, Optional
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.orm import joinedload
 
 from .base import BaseRepository
@@ -46,6 +46,14 @@ class MaslulRepository(BaseRepository[Maslul]):
         """Get only active routes."""
         return self.get_all(hativa_id=hativa_id, include_inactive=False)
     
+    def name_exists(self, hativa_id: int, name: str) -> bool:
+        """Check case-insensitively whether a route name is taken within a division."""
+        stmt = select(Maslul.maslul_id).where(
+            Maslul.hativa_id == hativa_id,
+            func.lower(Maslul.name) == name.lower()
+        ).limit(1)
+        return self.session.execute(stmt).first() is not None
+    
     def create(self, hativa_id: int, name: str, description: str = "",
                sla_days: int = 45, stage_a_days: int = 10,
                stage_b_days: int = 15, stage_c_days: int = 10,
@@ -5,7 +5,7 @@ System Settings repository for database operations.
 """
 
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 from sqlalchemy import select
 
 from .base import BaseRepository
@@ -32,6 +32,25 @@ class SettingsRepository(BaseRepository[SystemSetting]):
         setting = result.scalar_one_or_none()
         return setting.setting_value if setting else None
     
+    def get_settings(self, setting_keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Get several system setting values with a single query.
+        
+        Args:
+            setting_keys: Setting keys
+            
+        Returns:
+            Dictionary of setting_key -> setting_value (None for missing keys)
+        """
+        keys = list(setting_keys)
+        values = dict.fromkeys(keys)
+        if keys:
+            stmt = select(SystemSetting.setting_key, SystemSetting.setting_value).where(
+                SystemSetting.setting_key.in_(keys)
+            )
+            values.update(self.session.execute(stmt).tuples().all())
+        return values
+    
     def get_int_setting(self, setting_key: str, default: int) -> int:
         """
         Get an integer system setting with fallback.
@@ -100,6 +119,39 @@ class SettingsRepository(BaseRepository[SystemSetting]):
         self.session.flush()
         return True
     
+    def update_settings(self, settings: Dict[str, str], user_id: Optional[int] = None) -> int:
+        """
+        Update several system settings, loading existing rows with a single query.
+        
+        Args:
+            settings: Dictionary of setting_key -> new value
+            user_id: User performing the update
+            
+        Returns:
+            Number of settings written
+        """
+        if not settings:
+            return 0
+        stmt = select(SystemSetting).where(SystemSetting.setting_key.in_(list(settings)))
+        existing = {s.setting_key: s for s in self.session.execute(stmt).scalars()}
+        now = datetime.now()
+        
+        for setting_key, setting_value in settings.items():
+            setting = existing.get(setting_key)
+            if setting:
+                setting.setting_value = setting_value
+                setting.updated_at = now
+                setting.updated_by = user_id
+            else:
+                self.session.add(SystemSetting(
+                    setting_key=setting_key,
+                    setting_value=setting_value,
+                    updated_by=user_id
+                ))
+        
+        self.session.flush()
+        return len(settings)
+    
     def get_constraint_settings(self) -> Dict[str, Any]:
         """
         Get all constraint-related settings for scheduling.
@@ -5,8 +5,8 @@ User repository for database operations.
 """
 
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy import select, or_, func
+from typing import List, Optional, Tuple
+from sqlalchemy import select, or_, func, exists
 from sqlalchemy.orm import joinedload
 
 from .base import BaseRepository
@@ -432,6 +432,29 @@ class UserRepository(BaseRepository[User]):
         count = self.session.execute(stmt).scalar() or 0
         return count > 0
     
+    def find_conflicts(self, username: str, email: str,
+                       exclude_user_id: Optional[int] = None) -> Tuple[bool, bool]:
+        """
+        Check username and email uniqueness in a single query.
+        
+        Args:
+            username: Username to check
+            email: Email to check
+            exclude_user_id: Optional user ID to exclude
+            
+        Returns:
+            Tuple of (username_exists, email_exists)
+        """
+        def conflict(column, value):
+            condition = func.lower(column) == func.lower(value)
+            if exclude_user_id is not None:
+                condition = condition & (User.user_id != exclude_user_id)
+            return exists().where(condition)
+        
+        stmt = select(conflict(User.username, username), conflict(User.email, email))
+        username_exists, email_exists = self.session.execute(stmt).one()
+        return bool(username_exists), bool(email_exists)
+    
     def get_ad_users(self) -> List[User]:
         """Get all Active Directory users."""
         stmt = select(User).options(
@@ -441,6 +464,11 @@ class UserRepository(BaseRepository[User]):
         result = self.session.execute(stmt)
         return list(result.unique().scalars().all())
     
+    def count_ad_users(self) -> int:
+        """Count Active Directory users."""
+        stmt = select(func.count()).select_from(User).where(User.auth_source == 'ad')
+        return self.session.execute(stmt).scalar() or 0
+    
     def get_user_photo(self, user_id: int) -> Optional[bytes]:
         """
         Get user profile picture.
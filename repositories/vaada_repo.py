@@ -6,7 +6,7 @@ Vaada (Committee Meeting) repository for database operations.
 
 from datetime import date, datetime
 from typing import List, Optional, Tuple, Dict, Any
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_, or_, func, exists
 from sqlalchemy.orm import joinedload
 
 from .base import BaseRepository
@@ -166,6 +166,44 @@ class VaadaRepository(BaseRepository[Vaada]):
         self.session.flush()
         return True
     
+    def get_minimal_by_ids(self, vaadot_ids: List[int]) -> List[Tuple[int, int, Optional[str]]]:
+        """
+        Get ID, division and committee type name of active meetings with the given IDs.
+        
+        Args:
+            vaadot_ids: Meeting IDs to fetch
+            
+        Returns:
+            List of (vaadot_id, hativa_id, committee_name) rows (unknown or deleted IDs are skipped)
+        """
+        stmt = select(Vaada.vaadot_id, Vaada.hativa_id, CommitteeType.name).select_from(Vaada).outerjoin(
+            Vaada.committee_type
+        ).where(
+            Vaada.vaadot_id.in_(vaadot_ids),
+            or_(Vaada.is_deleted == 0, Vaada.is_deleted.is_(None))
+        )
+        return [tuple(row) for row in self.session.execute(stmt).all()]
+    
+    def get_names_outside_hativot(self, vaadot_ids: List[int], hativa_ids: List[int],
+                                  limit: Optional[int] = None) -> List[str]:
+        """
+        Get committee type names of active meetings not in any of the given divisions.
+        
+        Args:
+            vaadot_ids: Meeting IDs to check
+            hativa_ids: Allowed division IDs
+            limit: Maximum number of names to return
+            
+        Returns:
+            List of committee names (empty when all meetings are within the divisions)
+        """
+        stmt = select(CommitteeType.name).select_from(Vaada).join(Vaada.committee_type).where(
+            Vaada.vaadot_id.in_(vaadot_ids),
+            or_(Vaada.is_deleted == 0, Vaada.is_deleted.is_(None)),
+            Vaada.hativa_id.not_in(hativa_ids)
+        ).order_by(Vaada.vaadot_id).limit(limit)
+        return list(self.session.execute(stmt).scalars().all())
+    
     def soft_delete(self, vaadot_id: int, user_id: Optional[int] = None) -> bool:
         """
         Soft delete a committee meeting.
@@ -308,16 +346,17 @@ class VaadaRepository(BaseRepository[Vaada]):
         Returns:
             True if date is available
         """
-        stmt = select(func.count()).select_from(Vaada).where(
+        conditions = [
             Vaada.vaada_date == vaada_date,
             or_(Vaada.is_deleted == 0, Vaada.is_deleted.is_(None))
-        )
+        ]
         
         if exclude_vaadot_id is not None:
-            stmt = stmt.where(Vaada.vaadot_id != exclude_vaadot_id)
+            conditions.append(Vaada.vaadot_id != exclude_vaadot_id)
         
-        count = self.session.execute(stmt).scalar() or 0
-        return count == 0
+        # EXISTS stops at the first matching row instead of counting them all
+        taken = self.session.execute(select(exists().where(*conditions))).scalar()
+        return not taken
 
     def get_week_bounds(self, check_date: date) -> Tuple[date, date]:
         """Return start (Sunday) and end (Saturday) of the week for the given date."""
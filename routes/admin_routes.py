@@ -1,7 +1,8 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session, current_app
 from services_init import db, audit_logger, auth_manager, constraints_service
 from auth import login_required, admin_required, editing_permission_required
-from datetime import datetime
+from datetime import date
+from collections import defaultdict
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -79,7 +80,7 @@ def set_hativa_day_constraints():
         db.set_hativa_allowed_days(int(hativa_id), allowed_days_int)
         
         # Log the action
-        hativa = next((h for h in db.get_hativot() if h['hativa_id'] == int(hativa_id)), None)
+        hativa = db.get_hativa_by_id(int(hativa_id))
         if hativa:
             day_names = ['יום שני', 'יום שלישי', 'יום רביעי', 'יום חמישי', 'יום שישי', 'שבת', 'יום ראשון']
             selected_days = [day_names[int(d)] for d in allowed_days] if allowed_days else []
@@ -109,7 +110,7 @@ def update_hativa_color():
         success = db.update_hativa_color(int(hativa_id), color)
         if success:
             # Log the color update
-            hativa = next((h for h in db.get_hativot() if h['hativa_id'] == int(hativa_id)), None)
+            hativa = db.get_hativa_by_id(int(hativa_id))
             if hativa:
                 audit_logger.log_hativa_updated(int(hativa_id), hativa['name'], f'עדכון צבע ל-{color}')
             flash('צבע החטיבה עודכן בהצלחה', 'success')
@@ -128,30 +129,34 @@ def maslulim():
         maslulim_list = db.get_maslulim()
         hativot_list = db.get_hativot()
         
-        # Group maslulim by hativa for better organization and display control
+        # Bucket maslulim by hativa in one pass instead of rescanning the list per hativa
+        maslulim_by_hativa_id = defaultdict(list)
+        for m in maslulim_list:
+            maslulim_by_hativa_id[m['hativa_id']].append(m)
+
+        # Group maslulim by hativa for better organization and display control,
+        # and calculate per-hativa statistics with colors
         maslulim_by_hativa = []
+        maslulim_per_hativa = {}
+        maslulim_per_hativa_with_colors = {}
         for hativa in hativot_list:
-            grouped_maslulim = [m for m in maslulim_list if m['hativa_id'] == hativa['hativa_id']]
+            grouped_maslulim = maslulim_by_hativa_id.get(hativa['hativa_id'], [])
             maslulim_by_hativa.append({
                 'hativa_id': hativa['hativa_id'],
                 'hativa_name': hativa['name'],
                 'color': hativa.get('color'),
                 'maslulim': grouped_maslulim
             })
-        
-        # Calculate statistics with colors
-        maslulim_per_hativa_with_colors = {}
-        for hativa in hativot_list:
-            count = len([m for m in maslulim_list if m['hativa_id'] == hativa['hativa_id']])
+            maslulim_per_hativa[hativa['name']] = len(grouped_maslulim)
             maslulim_per_hativa_with_colors[hativa['name']] = {
-                'count': count,
+                'count': len(grouped_maslulim),
                 'color': hativa['color']
             }
         
         stats = {
             'total_maslulim': len(maslulim_list),
             'total_hativot': len(hativot_list),
-            'maslulim_per_hativa': {hativa['name']: len([m for m in maslulim_list if m['hativa_id'] == hativa['hativa_id']]) for hativa in hativot_list},
+            'maslulim_per_hativa': maslulim_per_hativa,
             'maslulim_per_hativa_with_colors': maslulim_per_hativa_with_colors
         }
         
@@ -195,18 +200,6 @@ def add_maslul():
             flash('שם המסלול חייב להכיל לפחות 2 תווים', 'error')
             return redirect(url_for('admin.maslulim'))
             
-        # Check if hativa exists
-        hativot = db.get_hativot()
-        if not any(h['hativa_id'] == int(hativa_id) for h in hativot):
-            flash('החטיבה שנבחרה לא קיימת במערכת', 'error')
-            return redirect(url_for('admin.maslulim'))
-            
-        # Check for duplicate names within the same hativa
-        existing_maslulim = db.get_maslulim(int(hativa_id))
-        if any(m['name'].lower() == name.lower() for m in existing_maslulim):
-            flash(f'מסלול בשם "{name}" כבר קיים בחטיבה זו', 'error')
-            return redirect(url_for('admin.maslulim'))
-        
         # Validate SLA and stage days
         try:
             sla_days = int(sla_days)
@@ -236,10 +229,22 @@ def add_maslul():
             flash('כל השדות חייבים להיות מספרים תקינים', 'error')
             return redirect(url_for('admin.maslulim'))
         
+        # Check if hativa exists
+        hativa_id = int(hativa_id)
+        hativa = db.get_hativa_by_id(hativa_id)
+        if not hativa:
+            flash('החטיבה שנבחרה לא קיימת במערכת', 'error')
+            return redirect(url_for('admin.maslulim'))
+            
+        # Check for duplicate names within the same hativa
+        if db.maslul_name_exists(hativa_id, name):
+            flash(f'מסלול בשם "{name}" כבר קיים בחטיבה זו', 'error')
+            return redirect(url_for('admin.maslulim'))
+        
         # Add the maslul
-        maslul_id = db.add_maslul(int(hativa_id), name, description, sla_days, 
+        maslul_id = db.add_maslul(hativa_id, name, description, sla_days, 
                                  stage_a_days, stage_b_days, stage_c_days, stage_d_days)
-        hativa_name = next(h['name'] for h in hativot if h['hativa_id'] == int(hativa_id))
+        hativa_name = hativa['name']
         audit_logger.log_maslul_created(maslul_id, name, hativa_name)
         flash(f'מסלול "{name}" נוסף בהצלחה לחטיבת {hativa_name}', 'success')
         
@@ -331,21 +336,19 @@ def delete_maslul(maslul_id):
     """Delete route with safety checks"""
     try:
         # Get maslul name before deletion
-        maslulim = db.get_maslulim()
-        maslul = next((m for m in maslulim if m['maslul_id'] == maslul_id), None)
+        maslul = db.get_maslul_by_id(maslul_id)
         
         if not maslul:
             flash('המסלול לא נמצא במערכת', 'error')
             return redirect(url_for('admin.maslulim'))
         
         # Check if maslul is used in any events (including deleted ones) and get examples
-        events = db.get_all_events(include_deleted=True)
-        maslul_events = [e for e in events if e.get('maslul_id') == maslul_id]
+        event_count = db.count_events_by_maslul(maslul_id)
         
-        if maslul_events:
+        if event_count:
             # Create examples list (up to 5 events)
             examples_list = []
-            for e in maslul_events[:5]:
+            for e in db.get_event_examples_by_maslul(maslul_id, limit=5):
                 event_name = e.get('name', 'ללא שם')
                 event_date = e.get('vaada_date')
                 if event_date:
@@ -355,10 +358,10 @@ def delete_maslul(maslul_id):
                     examples_list.append(f'"{event_name}" (ללא תאריך)')
             
             examples_text = ', '.join(examples_list)
-            if len(maslul_events) > 5:
-                examples_text += f' ועוד {len(maslul_events) - 5} אירועים'
+            if event_count > 5:
+                examples_text += f' ועוד {event_count - 5} אירועים'
             
-            flash(f'לא ניתן למחוק מסלול המשויך ל-{len(maslul_events)} אירועים. יש למחוק תחילה את האירועים הקשורים. דוגמאות לאירועים: {examples_text}.', 'error')
+            flash(f'לא ניתן למחוק מסלול המשויך ל-{event_count} אירועים. יש למחוק תחילה את האירועים הקשורים. דוגמאות לאירועים: {examples_text}.', 'error')
             return redirect(url_for('admin.maslulim'))
         
         # Delete the maslul
@@ -392,17 +395,12 @@ def exception_dates():
             return redirect(url_for('admin.exception_dates'))
         
         try:
-            exception_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-            db.add_exception_date(exception_date, description, date_type)
+            exception_date = date.fromisoformat(date_str)
+            date_id = db.add_exception_date(exception_date, description, date_type)
             
             # Recalculate all event deadlines to account for the new exception date
             updated_count = db.recalculate_all_event_deadlines()
             
-            # Get the date_id for logging (query just added record)
-            exception_dates_list = db.get_exception_dates(include_past=True)
-            added_date = next((ed for ed in exception_dates_list if ed['exception_date'] == date_str), None)
-            date_id = added_date['date_id'] if added_date else None
-            
             audit_logger.log_exception_date_added(date_id, date_str, description)
             flash(f'תאריך חריג {date_str} נוסף בהצלחה. עודכנו {updated_count} אירועים.', 'success')
         except ValueError:
@@ -442,7 +440,7 @@ def edit_exception_date(date_id):
             flash('תאריך הוא שדה חובה', 'error')
             return redirect(url_for('admin.exception_dates'))
         
-        exception_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+        exception_date = date.fromisoformat(date_str)
         success = db.update_exception_date(date_id, exception_date, description, date_type)
         
         if success:
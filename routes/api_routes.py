@@ -1,11 +1,142 @@
 from flask import Blueprint, jsonify, request, current_app, session
 from services_init import db, audit_logger, auth_manager
 from auth import admin_required, login_required, editing_permission_required
-from datetime import datetime
+from datetime import date
 from services.committee_service import get_committee_summary
+from db import get_ref_data_version
 
 api_bp = Blueprint('api', __name__)
 
+
+# Upper bound on moves accepted by /api/move_batch in one request
+MAX_BATCH_MOVES = 200
+# Upper bounds on IDs accepted by the bulk delete endpoints in one request
+MAX_BULK_DELETE_EVENTS = 1000
+MAX_BULK_DELETE_COMMITTEES = 500
+
+def _int_ids(values) -> list:
+    """Normalize an id list to ints, deduplicated in request order; raises ValueError with the user message"""
+    if not isinstance(values, list):
+        return []
+    ids = {}
+    bad = []
+    for value in values:
+        try:
+            if isinstance(value, (bool, float)):
+                raise TypeError
+            ids[int(value)] = None
+        except (TypeError, ValueError):
+            bad.append(value)
+    if bad:
+        raise ValueError(f'מזהים לא תקינים: {", ".join(str(v) for v in bad[:5])}')
+    return list(ids)
+
+def _ref_data_etag(*parts) -> str:
+    """Build an ETag tied to the current reference data version"""
+    return '-'.join(str(p) for p in (get_ref_data_version(), *parts))
+
+
+def _not_modified(etag: str):
+    """Return a 304 response if the client already holds this ETag, else None"""
+    # If-None-Match uses weak comparison
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    return None
+
+
+def _with_etag(response, etag: str):
+    """Attach a weak ETag and force revalidation on every use"""
+    # Weak: compress_response may serve the same data as gzip, br or identity bytes
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+def _parse_move_committee(payload: dict) -> tuple:
+    """Validate a move_committee body into (vaada_id, new_date); raises ValueError with the user message"""
+    try:
+        vaada_id = int(payload['vaada_id'])
+        new_date = payload['new_date']
+    except (KeyError, TypeError, ValueError):
+        raise ValueError('נתונים חסרים')
+    if not vaada_id or not new_date:
+        raise ValueError('נתונים חסרים')
+    try:
+        return vaada_id, date.fromisoformat(new_date)
+    except (TypeError, ValueError):
+        raise ValueError('פורמט תאריך לא תקין')
+
+def _parse_move_event(payload: dict) -> tuple:
+    """Validate a move_event body into (event_id, target_vaada_id); raises ValueError with the user message"""
+    try:
+        event_id = int(payload['event_id'])
+        target_vaada_id = int(payload['target_vaada_id'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError('נתונים חסרים')
+    if not event_id or not target_vaada_id:
+        raise ValueError('נתונים חסרים')
+    return event_id, target_vaada_id
+
+def _check_committee_move(user: dict, vaada_id: int, new_date_obj: date):
+    """Permission and availability checks for moving a committee; returns (vaada, None) or (None, (message, status))"""
+    # Get committee details to check permissions
+    vaada = db.get_vaada_by_id(vaada_id)
+    if not vaada:
+        return None, ('ועדה לא נמצאה', 404)
+    
+    # Check permissions: Only managers and admins can move committees
+    if user['role'] == 'user':
+        return None, ('רק מנהלים ומנהלי מערכת יכולים להזיז ועדות', 403)
+    
+    # Manager can only move committees in their division
+    if user['role'] == 'manager':
+        if vaada['hativa_id'] != user['hativa_id']:
+            return None, ('מנהל יכול להזיז רק ועדות בחטיבה שלו', 403)
+    
+    # Admin can move any committee (no additional checks needed)
+    
+    # Ensure target date is an allowed business day
+    if not db.is_work_day(new_date_obj):
+        return None, ('לא ניתן להעביר ועדה ליום שאינו יום עסקים', 400)
+
+    # Check if target date is available (one meeting per day constraint)
+    # But allow moving the same committee to a different date
+    if db.date_has_other_vaada(new_date_obj, exclude_vaada_id=vaada_id):
+        return None, ('התאריך תפוס - יש כבר ועדה ביום זה', 400)
+    
+    return vaada, None
+
+def _check_event_move(event_id: int, target_vaada_id: int):
+    """Existence and division checks for moving an event; returns (move_context, None) or (None, (message, status))"""
+    # Get event, route and target committee details for validation in one query
+    current_app.logger.debug("Looking for event_id: %s, target_vaada_id: %s", event_id, target_vaada_id)
+    move_context = db.get_move_event_context(event_id, target_vaada_id)
+    
+    if not move_context:
+        current_app.logger.error("Event or committee not found. Event: %s, Committee: %s", event_id, target_vaada_id)
+        return None, ('אירוע או ועדה לא נמצאו', 404)
+    
+    # Validate that event's route belongs to target committee's division
+    if move_context['maslul_hativa_id'] != move_context['target_hativa_id']:
+        audit_logger.log_error(
+            audit_logger.ACTION_MOVE,
+            audit_logger.ENTITY_EVENT,
+            'ניסיון להעביר אירוע לועדה מחטיבה אחרת',
+            entity_id=event_id,
+            entity_name=move_context['event_name'] or 'Unknown'
+        )
+        return None, ('לא ניתן להעביר אירוע לועדה מחטיבה אחרת', 400)
+    
+    return move_context, None
+
+def _no_content():
+    """Empty success reply for drag endpoints - the client holds the success message"""
+    response = current_app.response_class(status=204)
+    response.cache_control.no_store = True
+    return response
+
 @api_bp.route('/api/toggle_editing_period', methods=['POST'])
 @admin_required
 def toggle_editing_period():
@@ -64,7 +195,10 @@ def bulk_delete():
         current_app.logger.info(f"Form data: {request.form}")
         
         item_type = request.form.get('type')
-        item_ids = request.form.getlist('ids[]')
+        try:
+            item_ids = _int_ids(request.form.getlist('ids[]'))
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
         
         current_app.logger.info(f"Processing delete for type={item_type}, ids={item_ids}")
         
@@ -76,7 +210,7 @@ def bulk_delete():
         
         if item_type == 'committee':
             for vaada_id in item_ids:
-                if db.delete_vaada(int(vaada_id)):
+                if db.delete_vaada(vaada_id):
                     success_count += 1
                 else:
                     error_count += 1
@@ -87,7 +221,7 @@ def bulk_delete():
                 
         elif item_type == 'event':
             for event_id in item_ids:
-                if db.delete_event(int(event_id)):
+                if db.delete_event(event_id):
                     success_count += 1
                 else:
                     error_count += 1
@@ -108,54 +242,99 @@ def bulk_delete():
         current_app.logger.error(f"Error in bulk delete: {e}", exc_info=True)
         return jsonify({'success': False, 'message': f'שגיאה במחיקה: {str(e)}'}), 500
 
-@api_bp.route('/api/move_committee', methods=['POST'])
+@api_bp.route('/api/events/bulk_delete', methods=['POST'])
 @login_required
-def move_committee():
-    """Move committee meeting to a different date"""
+@editing_permission_required
+def bulk_delete_events():
+    """Bulk soft delete events selected in the events table"""
     try:
-        data = request.get_json()
-        vaada_id = data.get('vaada_id')
-        new_date = data.get('new_date')
-        
-        if not vaada_id or not new_date:
-            return jsonify({'success': False, 'message': 'נתונים חסרים'}), 400
+        try:
+            event_ids = _int_ids((request.get_json(silent=True) or {}).get('event_ids'))
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        if not event_ids:
+            return jsonify({'success': False, 'message': 'לא נבחרו פריטים למחיקה'}), 400
+        if len(event_ids) > MAX_BULK_DELETE_EVENTS:
+            return jsonify({'success': False, 'message': f'ניתן למחוק עד {MAX_BULK_DELETE_EVENTS} אירועים בבקשה אחת'}), 400
         
-        # Get current user
         user = auth_manager.get_current_user()
-        if not user:
-            return jsonify({'success': False, 'message': 'נדרשת התחברות'}), 401
         
-        # Get committee details to check permissions
-        vaada = db.get_vaada_by_id(vaada_id)
-        if not vaada:
-            return jsonify({'success': False, 'message': 'ועדה לא נמצאה'}), 404
+        # Editors may only delete events in divisions they have access to (checked in SQL)
+        if user['role'] != 'admin':
+            forbidden = db.get_event_names_outside_hativot(event_ids, user['hativa_ids'])
+            if forbidden:
+                return jsonify({'success': False, 'message': f'אין לך הרשאה למחוק אירועים: {", ".join(forbidden)}'}), 403
         
-        # Check permissions: Only managers and admins can move committees
-        if user['role'] == 'user':
-            return jsonify({'success': False, 'message': 'רק מנהלים ומנהלי מערכת יכולים להזיז ועדות'}), 403
+        # Fetch only the selected rows
+        events_map = {e['event_id']: e for e in db.get_events_by_ids(event_ids)}
         
-        # Manager can only move committees in their division
-        if user['role'] == 'manager':
-            if vaada['hativa_id'] != user['hativa_id']:
-                return jsonify({'success': False, 'message': 'מנהל יכול להזיז רק ועדות בחטיבה שלו'}), 403
+        deleted_count = db.delete_events_bulk(list(events_map), user['user_id'])
         
-        # Admin can move any committee (no additional checks needed)
+        audit_logger.log_bulk(audit_logger.ACTION_DELETE, audit_logger.ENTITY_EVENT,
+                              [(event_id, event['name']) for event_id, event in events_map.items()])
         
-        # Validate date format and convert to date object
+        return jsonify({'success': True, 'deleted_count': deleted_count})
+    
+    except Exception as e:
+        current_app.logger.error(f"Error in bulk delete events: {e}", exc_info=True)
+        return jsonify({'success': False, 'message': f'שגיאה במחיקה: {str(e)}'}), 500
+
+@api_bp.route('/api/committees/bulk_delete', methods=['POST'])
+@login_required
+@editing_permission_required
+def bulk_delete_committees():
+    """Bulk soft delete committee meetings (and their events) selected in the committee view"""
+    try:
         try:
-            new_date_obj = datetime.strptime(new_date, '%Y-%m-%d').date()
-        except ValueError:
-            return jsonify({'success': False, 'message': 'פורמט תאריך לא תקין'}), 400
+            vaadot_ids = _int_ids((request.get_json(silent=True) or {}).get('vaadot_ids'))
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        if not vaadot_ids:
+            return jsonify({'success': False, 'message': 'לא נבחרו פריטים למחיקה'}), 400
+        if len(vaadot_ids) > MAX_BULK_DELETE_COMMITTEES:
+            return jsonify({'success': False, 'message': f'ניתן למחוק עד {MAX_BULK_DELETE_COMMITTEES} ועדות בבקשה אחת'}), 400
+        
+        user = auth_manager.get_current_user()
         
-        # Ensure target date is an allowed business day
-        if not db.is_work_day(new_date_obj):
-            return jsonify({'success': False, 'message': 'לא ניתן להעביר ועדה ליום שאינו יום עסקים'}), 400
+        # Editors may only delete committees in divisions they have access to (checked in SQL)
+        if user['role'] != 'admin':
+            forbidden = db.get_vaada_names_outside_hativot(vaadot_ids, user['hativa_ids'])
+            if forbidden:
+                return jsonify({'success': False, 'message': f'אין לך הרשאה למחוק ועדות: {", ".join(forbidden)}'}), 403
+        
+        # Fetch only the selected rows
+        vaadot_map = {v['vaadot_id']: v for v in db.get_vaadot_minimal_by_ids(vaadot_ids)}
+        
+        deleted_committees, deleted_events = db.delete_vaadot_bulk(list(vaadot_map), user['user_id'])
+        
+        audit_logger.log_bulk(audit_logger.ACTION_DELETE, audit_logger.ENTITY_VAADA,
+                              [(vaada_id, vaada['committee_name'] or 'Unknown') for vaada_id, vaada in vaadot_map.items()])
+        
+        return jsonify({'success': True, 'deleted_committees': deleted_committees, 'deleted_events': deleted_events})
+    
+    except Exception as e:
+        current_app.logger.error(f"Error in bulk delete committees: {e}", exc_info=True)
+        return jsonify({'success': False, 'message': f'שגיאה במחיקה: {str(e)}'}), 500
 
-        # Check if target date is available (one meeting per day constraint)
-        # But allow moving the same committee to a different date
-        existing_meetings = db.get_vaada_by_date(new_date_obj)
-        if existing_meetings and any(meeting['vaadot_id'] != vaada_id for meeting in existing_meetings):
-            return jsonify({'success': False, 'message': 'התאריך תפוס - יש כבר ועדה ביום זה'}), 400
+@api_bp.route('/api/move_committee', methods=['POST'])
+@login_required
+def move_committee():
+    """Move committee meeting to a different date"""
+    try:
+        try:
+            vaada_id, new_date_obj = _parse_move_committee(request.get_json(silent=True) or {})
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        
+        # Get current user
+        user = auth_manager.get_current_user()
+        if not user:
+            return jsonify({'success': False, 'message': 'נדרשת התחברות'}), 401
+        
+        vaada, error = _check_committee_move(user, vaada_id, new_date_obj)
+        if error:
+            message, status = error
+            return jsonify({'success': False, 'message': message}), status
         
         # Store old date and committee name for logging
         old_date = vaada['vaada_date'] if vaada else 'Unknown'
@@ -172,14 +351,14 @@ def move_committee():
                 str(ve),
                 entity_id=vaada_id,
                 entity_name=committee_name,
-                details=f'נסיון העברה מ-{old_date} ל-{new_date}'
+                details=f'נסיון העברה מ-{old_date} ל-{new_date_obj}'
             )
             return jsonify({'success': False, 'message': str(ve)}), 400
         
         if success:
             # Log successful move
-            audit_logger.log_vaada_moved(vaada_id, committee_name, old_date, new_date)
-            return jsonify({'success': True, 'message': 'הועדה הועברה בהצלחה'})
+            audit_logger.log_vaada_moved(vaada_id, committee_name, old_date, new_date_obj)
+            return _no_content()
         else:
             audit_logger.log_error(
                 audit_logger.ACTION_MOVE,
@@ -219,7 +398,7 @@ def duplicate_committee():
 
         # Validate target date
         try:
-            target_date_obj = datetime.strptime(target_date, '%Y-%m-%d').date()
+            target_date_obj = date.fromisoformat(target_date)
         except ValueError:
             return jsonify({'success': False, 'message': 'פורמט תאריך לא תקין'}), 400
 
@@ -274,40 +453,20 @@ def duplicate_committee():
 def move_event():
     """Move event to a different committee meeting"""
     try:
-        data = request.get_json()
-        event_id = data.get('event_id')
-        target_vaada_id = data.get('target_vaada_id')
-        
-        if not event_id or not target_vaada_id:
-            return jsonify({'success': False, 'message': 'נתונים חסרים'}), 400
-        
-        # Get event and target committee details for validation
-        current_app.logger.info(f"Looking for event_id: {event_id}, target_vaada_id: {target_vaada_id}")
-        event = db.get_event_by_id(event_id)
-        target_committee = db.get_vaada_by_id(target_vaada_id)
-        
-        current_app.logger.info(f"Found event: {event}")
-        current_app.logger.info(f"Found target_committee: {target_committee}")
+        try:
+            event_id, target_vaada_id = _parse_move_event(request.get_json(silent=True) or {})
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
         
-        if not event or not target_committee:
-            current_app.logger.error(f"Event or committee not found. Event: {event}, Committee: {target_committee}")
-            return jsonify({'success': False, 'message': 'אירוע או ועדה לא נמצאו'}), 404
+        move_context, error = _check_event_move(event_id, target_vaada_id)
+        if error:
+            message, status = error
+            return jsonify({'success': False, 'message': message}), status
         
-        # Validate that event's route belongs to target committee's division
-        route = db.get_maslul_by_id(event['maslul_id'])
-        if route['hativa_id'] != target_committee['hativa_id']:
-            audit_logger.log_error(
-                audit_logger.ACTION_MOVE,
-                audit_logger.ENTITY_EVENT,
-                'ניסיון להעביר אירוע לועדה מחטיבה אחרת',
-                entity_id=event_id,
-                entity_name=event.get('name', 'Unknown')
-            )
-            return jsonify({'success': False, 'message': 'לא ניתן להעביר אירוע לועדה מחטיבה אחרת'}), 400
+        event_name = move_context['event_name'] or 'Unknown'
         
-        # Get source committee name for logging
-        source_vaada = db.get_vaada_by_id(event.get('vaadot_id'))
-        source_committee_name = source_vaada['committee_name'] if source_vaada else 'Unknown'
+        # Source committee name for logging
+        source_committee_name = move_context['source_committee_name'] or 'Unknown'
         
         # Update event's committee meeting (includes max requests validation)
         user_role = session.get('role')
@@ -317,18 +476,18 @@ def move_event():
             # Log successful move
             audit_logger.log_event_moved(
                 event_id,
-                event.get('name', 'Unknown'),
+                event_name,
                 source_committee_name,
-                target_committee['committee_name']
+                move_context['target_committee_name']
             )
-            return jsonify({'success': True, 'message': 'האירוע הועבר בהצלחה'})
+            return _no_content()
         else:
             audit_logger.log_error(
                 audit_logger.ACTION_MOVE,
                 audit_logger.ENTITY_EVENT,
                 'שגיאה בעדכון מסד נתונים',
                 entity_id=event_id,
-                entity_name=event.get('name', 'Unknown')
+                entity_name=event_name
             )
             return jsonify({'success': False, 'message': 'שגיאה בהעברת האירוע'}), 500
     
@@ -353,89 +512,159 @@ def move_event():
         )
         return jsonify({'success': False, 'message': f'שגיאה: {str(e)}'}), 500
 
+@api_bp.route('/api/move_batch', methods=['POST'])
+@login_required
+@editing_permission_required
+def move_batch():
+    """Apply several committee/event moves in one request and one transaction"""
+    payload = request.get_json(silent=True) or {}
+    moves = payload.get('moves')
+    if not isinstance(moves, list) or not moves:
+        return jsonify({'success': False, 'message': 'נתונים חסרים'}), 400
+    if len(moves) > MAX_BATCH_MOVES:
+        return jsonify({'success': False, 'message': f'ניתן להעביר עד {MAX_BATCH_MOVES} פריטים בבקשה אחת'}), 400
+    
+    user = auth_manager.get_current_user()
+    if not user:
+        return jsonify({'success': False, 'message': 'נדרשת התחברות'}), 401
+    
+    try:
+        results = [None] * len(moves)
+        # (index, move for the DB batch, audit context) for moves that passed validation
+        pending = []
+        for index, move in enumerate(moves):
+            kind = move.get('kind') if isinstance(move, dict) else None
+            try:
+                if kind == 'committee':
+                    vaada_id, new_date_obj = _parse_move_committee(move)
+                    context, error = _check_committee_move(user, vaada_id, new_date_obj)
+                    db_move = {'kind': kind, 'vaada_id': vaada_id, 'new_date': new_date_obj}
+                elif kind == 'event':
+                    event_id, target_vaada_id = _parse_move_event(move)
+                    context, error = _check_event_move(event_id, target_vaada_id)
+                    db_move = {'kind': kind, 'event_id': event_id, 'target_vaada_id': target_vaada_id}
+                else:
+                    raise ValueError('סוג העברה לא תקין')
+            except ValueError as e:
+                results[index] = {'success': False, 'message': str(e)}
+                continue
+            if error:
+                results[index] = {'success': False, 'message': error[0]}
+                continue
+            pending.append((index, db_move, context))
+        
+        applied = db.apply_moves_batch([db_move for _, db_move, _ in pending], user_role=session.get('role'))
+        
+        for (index, db_move, context), result in zip(pending, applied):
+            results[index] = result
+            if db_move['kind'] == 'committee':
+                entity, entity_id = audit_logger.ENTITY_VAADA, db_move['vaada_id']
+                entity_name = context['committee_name']
+                if result['success']:
+                    audit_logger.log_vaada_moved(entity_id, entity_name, context['vaada_date'], db_move['new_date'])
+            else:
+                entity, entity_id = audit_logger.ENTITY_EVENT, db_move['event_id']
+                entity_name = context['event_name'] or 'Unknown'
+                if result['success']:
+                    audit_logger.log_event_moved(entity_id, entity_name,
+                                                 context['source_committee_name'] or 'Unknown',
+                                                 context['target_committee_name'])
+            if not result['success']:
+                audit_logger.log_error(audit_logger.ACTION_MOVE, entity, result['message'],
+                                       entity_id=entity_id, entity_name=entity_name)
+        
+        return jsonify({'success': all(r['success'] for r in results), 'results': results})
+    
+    except Exception as e:
+        current_app.logger.error(f"Error in batch move: {str(e)}")
+        audit_logger.log_error(audit_logger.ACTION_MOVE, audit_logger.ENTITY_VAADA, str(e))
+        return jsonify({'success': False, 'message': f'שגיאה: {str(e)}'}), 500
+
+def _committee_group(vaadot_id, committee_name, hativa_name, hativa_id, vaada_date,
+                     committee_type, committee_type_id):
+    """Empty events_by_committee entry for one committee meeting"""
+    return {
+        'committee_info': {
+            'vaadot_id': vaadot_id,
+            'committee_name': committee_name,
+            'hativa_name': hativa_name,
+            'hativa_id': hativa_id,
+            'vaada_date': vaada_date,
+            'committee_type': committee_type,
+            'committee_type_id': committee_type_id
+        },
+        'events': [],
+        'summary': {
+            'total_events': 0,
+            'total_expected_requests': 0,
+            'total_actual_submissions': 0,
+            'event_types': []
+        }
+    }
+
 @api_bp.route('/api/events_by_committee')
 @login_required
 def get_events_by_committee():
     """API endpoint to get events grouped by committee meetings"""
     try:
+        include_empty = request.args.get('include_empty') in ('1', 'true', 'True')
+        etag = _ref_data_etag('events_by_committee', int(include_empty))
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+
         # Get all events
         events = db.get_all_events()
-        include_empty = request.args.get('include_empty') in ('1', 'true', 'True')
 
-        # Group events by committee meeting (vaadot_id)
+        # Group events by committee meeting (vaadot_id); event types keep first-seen order
         events_by_committee = {}
+        event_types_by_committee = {}
         for event in events:
             vaadot_id = event.get('vaadot_id')
-            if vaadot_id:
-                if vaadot_id not in events_by_committee:
-                    events_by_committee[vaadot_id] = {
-                        'committee_info': {
-                            'vaadot_id': vaadot_id,
-                            'committee_name': event.get('committee_name', ''),
-                            'hativa_name': event.get('hativa_name', ''),
-                            'hativa_id': event.get('maslul_hativa_id') or event.get('hativa_id'),
-                            'vaada_date': event.get('vaada_date', ''),
-                            'committee_type': event.get('committee_type_name', ''),
-                            'committee_type_id': event.get('committee_type_id')
-                        },
-                        'events': [],
-                        'summary': {
-                            'total_events': 0,
-                            'total_expected_requests': 0,
-                            'total_actual_submissions': 0,
-                            'event_types': set()
-                        }
-                    }
-                events_by_committee[vaadot_id]['events'].append(event)
-
-                # Update summary
-                summary = events_by_committee[vaadot_id]['summary']
-                summary['total_events'] += 1
-                summary['total_expected_requests'] += event.get('expected_requests', 0) or 0
-                summary['total_actual_submissions'] += event.get('actual_submissions', 0) or 0
-                if event.get('event_type'):
-                    summary['event_types'].add(event.get('event_type'))
+            if not vaadot_id:
+                continue
+            group = events_by_committee.get(vaadot_id)
+            if group is None:
+                group = events_by_committee[vaadot_id] = _committee_group(
+                    vaadot_id, event.get('committee_name', ''), event.get('hativa_name', ''),
+                    event.get('maslul_hativa_id') or event.get('hativa_id'),
+                    event.get('vaada_date', ''), event.get('committee_type_name', ''),
+                    event.get('committee_type_id')
+                )
+                event_types_by_committee[vaadot_id] = {}
+            group['events'].append(event)
+
+            # Update summary
+            summary = group['summary']
+            summary['total_events'] += 1
+            summary['total_expected_requests'] += event.get('expected_requests') or 0
+            summary['total_actual_submissions'] += event.get('actual_submissions') or 0
+            event_type = event.get('event_type')
+            if event_type:
+                event_types_by_committee[vaadot_id][event_type] = None
+        for vaadot_id, event_types in event_types_by_committee.items():
+            events_by_committee[vaadot_id]['summary']['event_types'] = list(event_types)
 
         # Optionally include committees without events
         if include_empty:
-            committees = db.get_vaadot()
-            for c in committees:
+            for c in db.get_vaadot():
                 vid = c.get('vaadot_id')
                 if vid not in events_by_committee:
-                    events_by_committee[vid] = {
-                        'committee_info': {
-                            'vaadot_id': vid,
-                            'committee_name': c.get('committee_name', ''),
-                            'hativa_name': c.get('hativa_name', ''),
-                            'hativa_id': c.get('hativa_id'),
-                            'vaada_date': c.get('vaada_date', ''),
-                            'committee_type': '',
-                            'committee_type_id': c.get('committee_type_id')
-                        },
-                        'events': [],
-                        'summary': {
-                            'total_events': 0,
-                            'total_expected_requests': 0,
-                            'total_actual_submissions': 0,
-                            'event_types': set()
-                        }
-                    }
-
-        # Convert to list and format for JSON response
-        result = []
-        for vaadot_id, data in events_by_committee.items():
-            # Convert set to list for JSON serialization
-            data['summary']['event_types'] = list(data['summary']['event_types'])
-            result.append(data)
+                    events_by_committee[vid] = _committee_group(
+                        vid, c.get('committee_name', ''), c.get('hativa_name', ''), c.get('hativa_id'),
+                        c.get('vaada_date', ''), '', c.get('committee_type_id')
+                    )
+
+        result = list(events_by_committee.values())
 
         # Sort by committee date (newest first)
         result.sort(key=lambda x: x['committee_info']['vaada_date'] or '', reverse=True)
 
-        return jsonify({
+        return _with_etag(jsonify({
             'success': True,
             'events_by_committee': result,
             'total_committees': len(result)
-        })
+        }), etag)
 
     except Exception as e:
         return jsonify({
@@ -448,9 +677,16 @@ def get_events_by_committee():
 def committee_summary(committee_id: int):
     """Return committee details and up to 5 nearest events for hover popover"""
     try:
+        # Nearest events are relative to today, so the date is part of the ETag
+        etag = _ref_data_etag('committee_summary', committee_id, date.today().isoformat())
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+
         summary = get_committee_summary(db, committee_id)
-        status_code = 200 if summary.get('success') else 404
-        return jsonify(summary), status_code
+        if not summary.get('success'):
+            return jsonify(summary), 404
+        return _with_etag(jsonify(summary), etag)
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
@@ -459,14 +695,17 @@ def committee_summary(committee_id: int):
 def maslul_details(maslul_id):
     """Get details of a specific route including event count"""
     try:
+        etag = _ref_data_etag('maslul_details', maslul_id)
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+
         maslul = db.get_maslul_by_id(maslul_id)
         if not maslul:
             return jsonify({'success': False, 'error': 'המסלול לא נמצא'}), 404
             
-        # Get count of events using this maslul
-        events = db.get_all_events()
-        maslul_events = [e for e in events if e.get('maslul_id') == maslul_id]
-        events_count = len(maslul_events)
+        # Get count of active events using this maslul
+        events_count = db.count_events_by_maslul(maslul_id, include_deleted=False)
         
         # Add basic info
         data = {
@@ -478,7 +717,7 @@ def maslul_details(maslul_id):
             'can_delete': events_count == 0
         }
         
-        return jsonify({'success': True, 'data': data})
+        return _with_etag(jsonify({'success': True, 'data': data}), etag)
         
     except Exception as e:
         current_app.logger.error(f"Error getting maslul details: {e}")
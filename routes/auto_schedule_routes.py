@@ -6,6 +6,17 @@ from auth import editor_required
 
 auto_schedule_bp = Blueprint('auto_schedule', __name__)
 
+HEBREW_MONTHS = ('ינואר', 'פברואר', 'מרץ', 'אפריל', 'מאי', 'יוני',
+                 'יולי', 'אוגוסט', 'ספטמבר', 'אוקטובר', 'נובמבר', 'דצמבר')
+
+def _parse_suggested_date(value: str) -> date:
+    """Parse a draft's 'YYYY-MM-DD' or 'YYYY-MM-DDTHH:MM:SS' date string"""
+    try:
+        # Fixed-width ISO prefix - slicing avoids strptime's format parsing per suggestion
+        return date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+    except (ValueError, IndexError):
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S' if 'T' in value else '%Y-%m-%d').date()
+
 @auto_schedule_bp.route('/auto_schedule')
 @editor_required
 def auto_schedule():
@@ -46,11 +57,9 @@ def generate_auto_schedule():
         elif month_selection_type == 'range':
             start_month = request.form.get('start_month', type=int)
             end_month = request.form.get('end_month', type=int)
-            if start_month <= end_month:
-                months_to_process = list(range(start_month, end_month + 1))
-            else:
-                # Handle year wrap-around (e.g., Nov-Feb)
-                months_to_process = list(range(start_month, 13)) + list(range(1, end_month + 1))
+            # Modular arithmetic handles year wrap-around (e.g., Nov-Feb) uniformly
+            month_count = ((end_month - start_month) % 12) + 1
+            months_to_process = [((start_month - 1 + i) % 12) + 1 for i in range(month_count)]
         
         if not months_to_process:
             flash('יש לבחור לפחות חודש אחד', 'warning')
@@ -92,9 +101,7 @@ def generate_auto_schedule():
                 current_app.logger.warning(f"Failed to generate schedule for {year}/{month}: {result.message}")
         
         if not all_suggestions:
-            months_names = [['ינואר', 'פברואר', 'מרץ', 'אפריל', 'מאי', 'יוני',
-                            'יולי', 'אוגוסט', 'ספטמבר', 'אוקטובר', 'נובמבר', 'דצמבר'][m-1] 
-                           for m in months_to_process]
+            months_names = [HEBREW_MONTHS[m - 1] for m in months_to_process]
             flash(f'לא ניתן ליצור תזמון עבור החודשים: {", ".join(months_names)}', 'warning')
             return redirect(url_for('auto_schedule.auto_schedule'))
         
@@ -136,9 +143,7 @@ def generate_auto_schedule():
         
         current_app.logger.info(f"Stored draft in DB: id={draft_id}, {len(all_suggestions)} suggestions for {year}")
         
-        months_names = [['ינואר', 'פברואר', 'מרץ', 'אפריל', 'מאי', 'יוני',
-                        'יולי', 'אוגוסט', 'ספטמבר', 'אוקטובר', 'נובמבר', 'דצמבר'][m-1] 
-                       for m in successful_months]
+        months_names = [HEBREW_MONTHS[m - 1] for m in successful_months]
         flash(f'נוצרו {len(all_suggestions)} הצעות ישיבות עבור {", ".join(months_names)} {year}', 'success')
         return redirect(url_for('auto_schedule.review_auto_schedule'))
         
@@ -163,7 +168,7 @@ def review_auto_schedule():
         draft = db.get_schedule_draft(draft_id)
         if draft:
             try:
-                pending_schedule = json.loads(draft['data'])
+                pending_schedule = current_app.json.loads(draft['data'])
             except json.JSONDecodeError:
                 current_app.logger.error(f"Failed to decode draft {draft_id}")
     
@@ -175,37 +180,30 @@ def review_auto_schedule():
         flash('אין לוח זמנים ממתין לאישור (פג תוקף או לא נמצא)', 'warning')
         return redirect(url_for('auto_schedule.auto_schedule'))
     
-    # Get hativot and committee types for display
-    hativot = {h['hativa_id']: h for h in db.get_hativot()}
-    committee_types = {ct['committee_type_id']: ct for ct in db.get_committee_types()}
+    # Get hativa names for display
+    hativa_names = {h['hativa_id']: h['name'] for h in db.get_hativot()}
     
-    # Enrich suggestions with names and parse dates
-    enriched_suggestions = []
-    for suggestion in pending_schedule['suggestions']:
+    # Enrich suggestions in place with names and parse dates
+    enriched_suggestions = pending_schedule['suggestions']
+    for suggestion in enriched_suggestions:
         # Parse dates if they are strings (from JSON)
         if isinstance(suggestion.get('suggested_date'), str):
-            suggestion['suggested_date'] = datetime.strptime(suggestion['suggested_date'], '%Y-%m-%dT%H:%M:%S' if 'T' in suggestion['suggested_date'] else '%Y-%m-%d').date()
-            
-        enriched_suggestions.append({
-            **suggestion,
-            'hativa_name': hativot.get(suggestion['hativa_id'], {}).get('name', 'לא ידוע'),
-            'committee_type_name': suggestion['committee_type']
-        })
+            suggestion['suggested_date'] = _parse_suggested_date(suggestion['suggested_date'])
+        
+        suggestion['hativa_name'] = hativa_names.get(suggestion['hativa_id'], 'לא ידוע')
+        suggestion['committee_type_name'] = suggestion['committee_type']
     
     # Validate schedule constraints for all months
     validation_result = {'valid': True, 'violations': [], 'warnings': []}
     
-    # If we have multiple months, validate each one
-    months = pending_schedule.get('months', [pending_schedule.get('month')])
-    for month in months:
-        if month:  # Skip None values
-            month_validation = auto_scheduler.validate_schedule_constraints(
-                pending_schedule['year'], month
-            )
-            if not month_validation['valid']:
-                validation_result['valid'] = False
-                validation_result['violations'].extend(month_validation.get('violations', []))
-            validation_result['warnings'].extend(month_validation.get('warnings', []))
+    # Validate all months with a single query
+    months = [m for m in pending_schedule.get('months', [pending_schedule.get('month')]) if m]
+    monthly_validation = auto_scheduler.validate_schedule_constraints_bulk(pending_schedule['year'], months)
+    for month_validation in monthly_validation.values():
+        if not month_validation['valid']:
+            validation_result['valid'] = False
+            validation_result['violations'].extend(month_validation.get('violations', []))
+        validation_result['warnings'].extend(month_validation.get('warnings', []))
     
     # Get current user info
     current_user = auth_manager.get_current_user()
@@ -228,7 +226,7 @@ def approve_auto_schedule():
         if draft_id:
             draft = db.get_schedule_draft(draft_id)
             if draft:
-                pending_schedule = json.loads(draft['data'])
+                pending_schedule = current_app.json.loads(draft['data'])
         
         # Fallback
         if not pending_schedule:
@@ -243,24 +241,16 @@ def approve_auto_schedule():
             flash('יש לבחור לפחות הצעה אחת', 'warning')
             return redirect(url_for('auto_schedule.review_auto_schedule'))
         
-        # Convert to integers and get selected suggestions
-        selected_indices = [int(idx) for idx in selected_meetings]
+        # Convert to integers and get selected suggestions (out-of-range indices are dropped)
         suggestions = pending_schedule.get('suggestions', [])
-        
-        # Filter selected suggestions
-        selected_meeting_suggestions = []
-        for idx in selected_indices:
-            if 0 <= idx < len(suggestions):
-                sug = suggestions[idx]
-                # Ensure date objects
-                if isinstance(sug.get('suggested_date'), str):
-                     # Handle ISO format or simple date
-                     date_str = sug['suggested_date']
-                     if 'T' in date_str:
-                         sug['suggested_date'] = datetime.strptime(date_str, '%Y-%m-%dT%H:%M:%S').date()
-                     else:
-                         sug['suggested_date'] = datetime.strptime(date_str, '%Y-%m-%d').date()
-                selected_meeting_suggestions.append(sug)
+        n = len(suggestions)
+        selected_meeting_suggestions = [suggestions[i] for i in map(int, selected_meetings) if 0 <= i < n]
+
+        for sug in selected_meeting_suggestions:
+            # Ensure date objects
+            if isinstance(sug.get('suggested_date'), str):
+                 # Handle ISO format or simple date
+                 sug['suggested_date'] = _parse_suggested_date(sug['suggested_date'])
         
         if not selected_meeting_suggestions:
             flash('לא נמצאו הצעות תקינות לאישור', 'error')
@@ -1,10 +1,27 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session, current_app
 from services_init import db, audit_logger, auth_manager
 from auth import login_required
-from datetime import datetime
+from datetime import datetime, date
+from typing import Optional
 
 committee_bp = Blueprint('committees', __name__, url_prefix='/committees')
 
+# Fallback formats for browsers that don't submit ISO dates
+MEETING_DATE_FORMATS = ('%d/%m/%Y', '%m/%d/%Y', '%Y/%m/%d')
+
+def _parse_meeting_date(value: str) -> Optional[date]:
+    """Parse a submitted meeting date, trying ISO first; returns None if no format matches"""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        pass
+    for fmt in MEETING_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
 @committee_bp.route('/add', methods=['POST'])
 def add_committee_meeting():
     """Add new committee meeting"""
@@ -39,16 +56,10 @@ def add_committee_meeting():
     print(f"DEBUG: Received date value: '{vaada_date}' (type: {type(vaada_date).__name__})")
 
     try:
+        committee_type_id = int(committee_type_id)
+
         # Try multiple date formats to handle different browser formats
-        meeting_date = None
-        date_formats = ['%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%Y/%m/%d']
-        
-        for fmt in date_formats:
-            try:
-                meeting_date = datetime.strptime(vaada_date, fmt).date()
-                break
-            except ValueError:
-                continue
+        meeting_date = _parse_meeting_date(vaada_date)
         
         if meeting_date is None:
             raise ValueError(f'פורמט תאריך לא תקין: {vaada_date}. נא להזין תאריך בפורמט YYYY-MM-DD')
@@ -58,8 +69,8 @@ def add_committee_meeting():
         
         # Try to add meeting (admins get warnings instead of errors)
         vaadot_id, warning_message = db.add_vaada(
-            int(committee_type_id),
-            int(hativa_id),
+            committee_type_id,
+            target_hativa_id,
             meeting_date,
             notes=notes,
             start_time=start_time,
@@ -68,8 +79,7 @@ def add_committee_meeting():
         )
         
         # Get committee name for logging
-        committee_types = db.get_committee_types()
-        committee_type = next((ct for ct in committee_types if ct['committee_type_id'] == int(committee_type_id)), None)
+        committee_type = db.get_committee_type_by_id(committee_type_id)
         committee_name = committee_type['name'] if committee_type else 'Unknown'
         
         audit_logger.log_vaada_created(vaadot_id, committee_name, meeting_date.strftime('%Y-%m-%d'))
@@ -128,27 +138,20 @@ def edit_committee_meeting(vaadot_id):
         return redirect(url_for('main.index'))
 
     try:
+        committee_type_id = int(committee_type_id)
+
         # Try multiple date formats to handle different browser formats
-        meeting_date = None
-        date_formats = ['%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%Y/%m/%d']
-        
-        for fmt in date_formats:
-            try:
-                meeting_date = datetime.strptime(vaada_date, fmt).date()
-                break
-            except ValueError:
-                continue
+        meeting_date = _parse_meeting_date(vaada_date)
         
         if meeting_date is None:
             raise ValueError(f'פורמט תאריך לא תקין: {vaada_date}. נא להזין תאריך בפורמט YYYY-MM-DD')
         
         # Get user role for constraint checking
         user_role = session.get('role')
-        success = db.update_vaada(vaadot_id, int(committee_type_id), target_hativa_id, meeting_date, notes=notes, start_time=start_time, end_time=end_time, user_role=user_role)
+        success = db.update_vaada(vaadot_id, committee_type_id, target_hativa_id, meeting_date, notes=notes, start_time=start_time, end_time=end_time, user_role=user_role)
         if success:
             # Get committee name for logging
-            committee_types = db.get_committee_types()
-            committee_type = next((ct for ct in committee_types if ct['committee_type_id'] == int(committee_type_id)), None)
+            committee_type = db.get_committee_type_by_id(committee_type_id)
             committee_name = committee_type['name'] if committee_type else 'Unknown'
             
             audit_logger.log_vaada_updated(vaadot_id, committee_name, meeting_date.strftime('%Y-%m-%d'))
@@ -195,12 +198,11 @@ def delete_committee_meeting(vaadot_id):
         user_id = current_user['user_id']
         
         # First delete all related events
-        events = db.get_all_events()
-        related_events = [e for e in events if e['vaadot_id'] == vaadot_id]
+        related_events = db.delete_events_by_vaada(vaadot_id, user_id)
         
-        for event in related_events:
-            db.delete_event(event['event_id'], user_id)
-            audit_logger.log_event_deleted(event['event_id'], event['name'])
+        if related_events:
+            audit_logger.log_bulk(audit_logger.ACTION_DELETE, audit_logger.ENTITY_EVENT,
+                                  [(event['event_id'], event['name']) for event in related_events])
         
         # Then delete the committee meeting
         success = db.delete_vaada(vaadot_id, user_id)
@@ -5,6 +5,19 @@ from services.committee_types_service import CommitteeTypeRequest
 
 committee_type_bp = Blueprint('committee_types', __name__)
 
+def _committee_type_request_from_form(form) -> CommitteeTypeRequest:
+    """Build a committee type request from submitted form data, parsing each field once"""
+    return CommitteeTypeRequest(
+        hativa_id=form.get('hativa_id', type=int),
+        name=form.get('name', '').strip(),
+        scheduled_day=form.get('scheduled_day', type=int),
+        frequency=form.get('frequency', '').strip(),
+        # Missing, empty and non-numeric values all yield None
+        week_of_month=form.get('week_of_month', type=int),
+        description=form.get('description', '').strip(),
+        is_operational=1 if form.get('is_operational') in ('1', 'on', 'true', 'True') else 0
+    )
+
 @committee_type_bp.route('/committee_types')
 @editor_required
 def committee_types():
@@ -38,23 +51,14 @@ def committee_types():
 def add_committee_type():
     """Add new committee type"""
     # Create request object from form data
-    committee_type_request = CommitteeTypeRequest(
-        hativa_id=request.form.get('hativa_id', type=int),
-        name=request.form.get('name', '').strip(),
-        scheduled_day=request.form.get('scheduled_day', type=int),
-        frequency=request.form.get('frequency', '').strip(),
-        week_of_month=request.form.get('week_of_month', type=int) if request.form.get('week_of_month') else None,
-        description=request.form.get('description', '').strip(),
-        is_operational=1 if request.form.get('is_operational') in ('1', 'on', 'true', 'True') else 0
-    )
+    committee_type_request = _committee_type_request_from_form(request.form)
     
     # Use service to create committee type
     response = committee_types_service.create_committee_type(committee_type_request)
     
     # Log the operation
     if response.success and response.committee_type_id:
-        hativot = db.get_hativot()
-        hativa = next((h for h in hativot if h['hativa_id'] == committee_type_request.hativa_id), None)
+        hativa = db.get_hativa_by_id(committee_type_request.hativa_id)
         hativa_name = hativa['name'] if hativa else 'Unknown'
         audit_logger.log_committee_type_created(
             response.committee_type_id,
@@ -81,15 +85,7 @@ def update_committee_type():
     committee_type_id = request.form.get('committee_type_id', type=int)
     
     # Create request object from form data
-    committee_type_request = CommitteeTypeRequest(
-        hativa_id=request.form.get('hativa_id', type=int),
-        name=request.form.get('name', '').strip(),
-        scheduled_day=request.form.get('scheduled_day', type=int),
-        frequency=request.form.get('frequency', '').strip(),
-        week_of_month=request.form.get('week_of_month', type=int) if request.form.get('week_of_month') else None,
-        description=request.form.get('description', '').strip(),
-        is_operational=1 if request.form.get('is_operational') in ('1', 'on', 'true', 'True') else 0
-    )
+    committee_type_request = _committee_type_request_from_form(request.form)
     
     # Use service to update committee type
     response = committee_types_service.update_committee_type(committee_type_id, committee_type_request)
@@ -118,8 +114,7 @@ def delete_committee_type():
     committee_type_id = request.form.get('committee_type_id', type=int)
     
     # Get committee type name before deletion
-    committee_types_list = db.get_committee_types()
-    committee_type = next((ct for ct in committee_types_list if ct['committee_type_id'] == committee_type_id), None)
+    committee_type = db.get_committee_type_by_id(committee_type_id)
     ct_name = committee_type['name'] if committee_type else 'Unknown'
     
     # Use service to delete committee type
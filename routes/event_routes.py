@@ -1,6 +1,10 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify, current_app, session
-from services_init import db, auth_manager, audit_logger
+from flask import Blueprint, stream_template, stream_with_context, get_flashed_messages, request, flash, redirect, url_for, jsonify, current_app, session
+from datetime import date
+from itertools import chain
+from typing import Optional
+from services_init import db, auth_manager, audit_logger, cache
 from auth import login_required, editing_permission_required
+from db import get_ref_data_version
 
 event_bp = Blueprint('events', __name__)
 
@@ -125,66 +129,113 @@ def delete_event(event_id):
         current_app.logger.error(f"Error deleting event: {e}")
         return jsonify({'success': False, 'message': f'שגיאה: {str(e)}'}), 500
 
-# Event Table View
-@event_bp.route('/events_table')
-@login_required
-def events_table():
-    """Events table view with advanced filtering"""
+EVENTS_TABLE_DEFAULT_PER_PAGE = 100
+EVENTS_TABLE_MAX_PER_PAGE = 500
+# Streamed HTML is flushed to the socket in chunks of roughly this many characters
+EVENTS_TABLE_STREAM_CHUNK = 16 * 1024
+
+# Closes a page whose rendering failed after its first chunk was already sent
+EVENTS_TABLE_STREAM_ERROR = '<div class="alert alert-danger m-3">שגיאה בטעינת נתוני האירועים. אנא רענן את הדף.</div>'
+
+def _chunked(fragments, size: int = EVENTS_TABLE_STREAM_CHUNK):
+    """Coalesce Jinja's small output fragments into socket-sized chunks.
+    
+    An error before the first chunk propagates; a later one is logged and ends the
+    page with EVENTS_TABLE_STREAM_ERROR instead of cutting the response off.
+    """
+    buffer = []
+    buffered = 0
+    started = False
     try:
+        for fragment in fragments:
+            buffer.append(fragment)
+            buffered += len(fragment)
+            if buffered >= size:
+                started = True
+                yield ''.join(buffer)
+                buffer = []
+                buffered = 0
+    except Exception:
+        if not started:
+            raise
+        current_app.logger.exception('Error streaming the events table')
+        buffer.append(EVENTS_TABLE_STREAM_ERROR)
+    if buffer:
+        yield ''.join(buffer)
+
+@cache.memoize()
+def _events_table_data(ref_data_version: str, order: str, page: Optional[int] = None,
+                       per_page: int = EVENTS_TABLE_DEFAULT_PER_PAGE, with_count: bool = False) -> dict:
+    """Load events and filter options for the events table (memoized per data version)"""
+    pagination = None
+    if page:
+        # Fetch one extra row to learn whether a next page exists without a COUNT query
+        rows = db.get_events_page(per_page + 1, (page - 1) * per_page, descending=(order == 'desc'))
+        events = rows[:per_page]
+        pagination = {
+            'page': page,
+            'per_page': per_page,
+            'has_next': len(rows) > per_page,
+            'total': db.count_active_events() if with_count else None,
+        }
+    else:
         # Get all events with extended information
+        # Date columns are typed in the ORM models, so dates arrive as date/datetime objects
         events = db.get_all_events()
 
-        # Normalize date fields for consistent formatting in the template
-        from datetime import datetime, date
-        for event in events:
-            created_at = event.get('created_at')
-            if isinstance(created_at, str):
-                for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
-                    try:
-                        event['created_at'] = datetime.strptime(created_at, fmt)
-                        break
-                    except ValueError:
-                        continue
-
-            for date_field in ['call_deadline_date', 'intake_deadline_date', 'review_deadline_date', 'response_deadline_date', 'vaada_date']:
-                value = event.get(date_field)
-                if isinstance(value, str):
-                    for fmt in ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S'):
-                        try:
-                            event[date_field] = datetime.strptime(value, fmt).date()
-                            break
-                        except ValueError:
-                            continue
-
-        # Apply chronological ordering (ascending/descending) by committee date
-        order = (request.args.get('order') or 'asc').lower()
-        order = 'desc' if order == 'desc' else 'asc'
-
         # Place events without a committee date at the end in both orders
         events_with_date = [e for e in events if e.get('vaada_date')]
         events_without_date = [e for e in events if not e.get('vaada_date')]
         events_with_date.sort(key=lambda e: e.get('vaada_date') or date.max, reverse=(order == 'desc'))
         events = events_with_date + events_without_date
 
-        # Get filter options
-        hativot = db.get_hativot()
-        maslulim = db.get_maslulim()
-        committee_types = db.get_committee_types()
+    return {
+        'events': events,
+        'pagination': pagination,
+        # Filter options
+        'hativot': db.get_hativot(),
+        'maslulim': db.get_maslulim(),
+        'committee_types': db.get_committee_types(),
+        # Unique event types
+        'event_types': db.get_distinct_event_types(),
+    }
 
-        # Get unique event types
-        event_types = list(set([event.get('event_type', '') for event in events if event.get('event_type')]))
+# Event Table View
+@event_bp.route('/events_table')
+@login_required
+def events_table():
+    """Events table view with advanced filtering"""
+    try:
+        # Apply chronological ordering (ascending/descending) by committee date
+        order = (request.args.get('order') or 'asc').lower()
+        order = 'desc' if order == 'desc' else 'asc'
+
+        # Optional server-side pagination (?page=N&per_page=M, ?count=1 adds the total)
+        page = request.args.get('page', type=int)
+        if page is not None and page < 1:
+            page = 1
+        per_page = request.args.get('per_page', EVENTS_TABLE_DEFAULT_PER_PAGE, type=int)
+        per_page = min(max(per_page, 1), EVENTS_TABLE_MAX_PER_PAGE)
+        with_count = request.args.get('count') == '1'
+
+        # The data is user-independent, so it is shared until the reference data changes
+        table_data = _events_table_data(get_ref_data_version(), order, page, per_page, with_count)
 
         # Get current user info
         current_user = auth_manager.get_current_user()
 
-        return render_template('events_table.html', 
-                             events=events,
-                             hativot=hativot,
-                             maslulim=maslulim,
-                             committee_types=committee_types,
-                             event_types=event_types,
-                             current_user=current_user,
-                             order=order)
+        # The session cookie is written before a streamed body, so pop flashes now;
+        # the template's get_flashed_messages() then reads the request-cached copy
+        get_flashed_messages(with_categories=True)
+
+        # Stream the page so the browser starts on the header while the rows render
+        chunks = stream_with_context(_chunked(stream_template('events_table.html',
+                                                              **table_data,
+                                                              current_user=current_user,
+                                                              order=order)))
+        # Render the first chunk now, so an early template error still flashes and redirects
+        first_chunk = next(chunks, '')
+        return current_app.response_class(chain((first_chunk,), chunks))
     except Exception as e:
         flash(f'שגיאה בטעינת נתוני האירועים: {str(e)}', 'error')
         return redirect(url_for('main.index'))
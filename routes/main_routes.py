@@ -9,21 +9,14 @@ main_bp = Blueprint('main', __name__)
 @login_required
 def index():
     """Main dashboard"""
-    # Get summary statistics
+    # Get summary statistics (committees and events are embedded for the calendar)
     hativot = db.get_hativot()
     maslulim = db.get_maslulim()
     committee_types = db.get_committee_types()
     committees = db.get_vaadot()  # This now returns meeting instances
     events = db.get_all_events()
-    exception_dates = db.get_exception_dates()
     
-    # Debug logging
-    current_app.logger.info(f"Loaded {len(committees)} committees")
-    current_app.logger.info(f"Loaded {len(events)} events")
-    if committees:
-        current_app.logger.info(f"First committee: {committees[0]}")
-    if events:
-        current_app.logger.info(f"First event: {events[0]}")
+    current_app.logger.debug("Loaded %d committees and %d events", len(committees), len(events))
     
     stats = {
         'hativot_count': len(hativot),
@@ -31,7 +24,7 @@ def index():
         'committee_types_count': len(committee_types),
         'committees_count': len(committees),
         'events_count': len(events),
-        'exception_dates_count': len(exception_dates),
+        'exception_dates_count': db.count_exception_dates(),
         'business_days_this_month': 0
     }
     
@@ -47,7 +40,6 @@ def index():
                          committee_types=committee_types,
                          committees=committees,
                          events=events,
-                         exception_dates=exception_dates,
                          stats=stats,
                          current_user=current_user,
                          show_deadline_dates=show_deadline_dates)
@@ -5,6 +5,7 @@ from datetime import datetime, date
 from sqlalchemy import text
 from services_init import db
 from auth import admin_required
+from db import bump_ref_data_version
 
 migration_bp = Blueprint('migration', __name__)
 
@@ -81,6 +82,7 @@ def test_migration_insert(secret_key):
                         vaadot_errors.append(str(e))
             
             conn.commit()
+            bump_ref_data_version()
             results['vaadot_inserted'] = vaadot_inserted
             results['vaadot_errors'] = vaadot_errors
             
@@ -107,6 +109,7 @@ def test_migration_insert(secret_key):
                         events_errors.append(str(ex))
             
             conn.commit()
+            bump_ref_data_version()
             results['events_inserted'] = events_inserted
             results['events_errors'] = events_errors
             
@@ -189,6 +192,7 @@ def run_migration(secret_key):
                     except Exception as e:
                         current_app.logger.warning(f"Could not clear {table}: {e}")
                 conn.commit()
+                bump_ref_data_version()
         
         # Import order to respect foreign key relationships
         import_order = [
@@ -244,6 +248,7 @@ def run_migration(secret_key):
                     current_app.logger.info(f"Imported {success_count} records to {table}")
         
             conn.commit()
+            bump_ref_data_version()
             
             # Reset sequences for PostgreSQL
             sequence_tables = [
@@ -376,6 +381,7 @@ def import_data_from_json():
                 imported_counts[table] = success_count
             
             conn.commit()
+            bump_ref_data_version()
         
         # Reset sequences for PostgreSQL
         sequence_tables = [
@@ -454,6 +460,7 @@ def fix_schema(secret_key):
                 try:
                     conn.execute(text(sql_str))
                     conn.commit()
+                    bump_ref_data_version()
                     fixes.append(success_msg)
                 except Exception as e:
                     conn.rollback()
@@ -41,8 +41,7 @@ def restore_vaada_route(vaadot_id):
             return jsonify({'success': False, 'message': 'משתמשים רגילים לא יכולים לשחזר פריטים'}), 403
         
         # Get the vaada to check permissions for managers/editors
-        deleted_vaadot = db.get_deleted_vaadot()
-        vaada = next((v for v in deleted_vaadot if v['vaadot_id'] == vaadot_id), None)
+        vaada = db.get_deleted_vaada(vaadot_id)
         
         if not vaada:
             return jsonify({'success': False, 'message': 'ועדה לא נמצאה בסל המחזור'}), 404
@@ -78,8 +77,7 @@ def restore_event_route(event_id):
             return jsonify({'success': False, 'message': 'משתמשים רגילים לא יכולים לשחזר פריטים'}), 403
         
         # Get the event to check permissions for managers/editors
-        deleted_events = db.get_deleted_events()
-        event = next((e for e in deleted_events if e['event_id'] == event_id), None)
+        event = db.get_deleted_event(event_id)
         
         if not event:
             return jsonify({'success': False, 'message': 'אירוע לא נמצא בסל המחזור'}), 404
@@ -115,8 +113,7 @@ def permanent_delete_vaada_route(vaadot_id):
             return jsonify({'success': False, 'message': 'רק מנהלי מערכת יכולים למחוק לצמיתות'}), 403
         
         # Get the vaada info for logging
-        deleted_vaadot = db.get_deleted_vaadot()
-        vaada = next((v for v in deleted_vaadot if v['vaadot_id'] == vaadot_id), None)
+        vaada = db.get_deleted_vaada(vaadot_id)
         
         if not vaada:
             return jsonify({'success': False, 'message': 'ועדה לא נמצאה בסל המחזור'}), 404
@@ -148,8 +145,7 @@ def permanent_delete_event_route(event_id):
             return jsonify({'success': False, 'message': 'רק מנהלי מערכת יכולים למחוק לצמיתות'}), 403
         
         # Get the event info for logging
-        deleted_events = db.get_deleted_events()
-        event = next((e for e in deleted_events if e['event_id'] == event_id), None)
+        event = db.get_deleted_event(event_id)
         
         if not event:
             return jsonify({'success': False, 'message': 'אירוע לא נמצא בסל המחזור'}), 404
@@ -1,11 +1,15 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for, session, jsonify, current_app
+from flask import Blueprint, render_template, request, flash, redirect, url_for, session, jsonify, current_app, stream_with_context
 from services_init import db, auth_manager, audit_logger, ad_service
 from auth import admin_required
 import os
-from datetime import datetime
+from datetime import datetime, date
 
 settings_bp = Blueprint('settings', __name__)
 
+# AuditLog columns written to exports, in header order
+AUDIT_EXPORT_COLUMNS = ['timestamp', 'username', 'action', 'entity_type', 'entity_name',
+                        'details', 'ip_address', 'status', 'error_message']
+
 @settings_bp.route('/admin/audit_logs')
 @admin_required
 def admin_audit_logs():
@@ -30,48 +34,34 @@ def admin_audit_logs():
         end_date_obj = None
         if start_date:
             try:
-                start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
+                start_date_obj = date.fromisoformat(start_date)
             except ValueError:
                 pass
         if end_date:
             try:
-                end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
+                end_date_obj = date.fromisoformat(end_date)
             except ValueError:
                 pass
         
-        # Build filters for username search
-        user_id_filter = None
-        if username:
-            # Search for user by username
-            all_users = db.get_all_users()
-            matching_users = [u for u in all_users if username.lower() in u['username'].lower()]
-            if matching_users:
-                user_id_filter = matching_users[0]['user_id']
-            else:
-                # No matching user, use impossible ID
-                user_id_filter = -1
-        
         # Get logs with filters
         logs = db.get_audit_logs(
             limit=per_page,
             offset=offset,
-            user_id=user_id_filter,
+            username=username,
             entity_type=entity_type,
             action=action,
+            status=status_filter,
             search_text=search_text,
             start_date=start_date_obj,
             end_date=end_date_obj
         )
         
-        # Filter by status if needed (not in DB method yet)
-        if status_filter:
-            logs = [log for log in logs if log['status'] == status_filter]
-        
         # Get total count
         total_count = db.get_audit_logs_count(
-            user_id=user_id_filter,
+            username=username,
             entity_type=entity_type,
             action=action,
+            status=status_filter,
             search_text=search_text,
             start_date=start_date_obj,
             end_date=end_date_obj
@@ -121,20 +111,19 @@ def export_audit_logs():
         start_date_obj = None
         end_date_obj = None
         if start_date:
-            start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
+            start_date_obj = date.fromisoformat(start_date)
         if end_date:
-            end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
-        
-        # Get all matching logs
-        logs = db.get_audit_logs(
-            limit=10000,  # Large limit for export
-            offset=0,
-            entity_type=entity_type,
-            action=action,
-            search_text=search_text,
-            start_date=start_date_obj,
-            end_date=end_date_obj
-        )
+            end_date_obj = date.fromisoformat(end_date)
+        
+        filters = {
+            'username': username,
+            'entity_type': entity_type,
+            'action': action,
+            'search_text': search_text,
+            'start_date': start_date_obj,
+            'end_date': end_date_obj
+        }
+        headers = ['Timestamp', 'Username', 'Action', 'Entity Type', 'Entity Name', 'Details', 'IP Address', 'Status', 'Error Message']
         
         timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
         
@@ -144,12 +133,14 @@ def export_audit_logs():
                 from openpyxl import Workbook
                 from openpyxl.styles import Font, PatternFill, Alignment
                 
+                # Get all matching logs (the workbook is built in memory, so keep a cap)
+                logs = db.get_audit_logs(limit=10000, offset=0, **filters)
+                
                 wb = Workbook()
                 ws = wb.active
                 ws.title = "Audit Logs"
                 
                 # Write header with styling
-                headers = ['Timestamp', 'Username', 'Action', 'Entity Type', 'Entity Name', 'Details', 'IP Address', 'Status', 'Error Message']
                 ws.append(headers)
                 
                 # Style header row
@@ -211,41 +202,30 @@ def export_audit_logs():
                 flash('ספריית openpyxl לא מותקנת. מייצא CSV במקום.', 'warning')
                 export_format = 'csv'  # Fall back to CSV
         
-        # Export as CSV (default or fallback)
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['Timestamp', 'Username', 'Action', 'Entity Type', 'Entity Name', 'Details', 'IP Address', 'Status', 'Error Message'])
-        
-        # Write data
-        for log in logs:
-            writer.writerow([
-                log['timestamp'],
-                log['username'],
-                log['action'],
-                log['entity_type'],
-                log['entity_name'],
-                log['details'],
-                log['ip_address'],
-                log['status'],
-                log['error_message']
-            ])
-        
-        # Create response
-        from flask import make_response
-        output.seek(0)
-        response = make_response(output.getvalue())
-        response.headers['Content-Disposition'] = f'attachment; filename=audit_logs_{timestamp_str}.csv'
-        response.headers['Content-Type'] = 'text/csv'
-        
-        # Log the export
-        audit_logger.log_success(
-            audit_logger.ACTION_EXPORT,
-            'audit_logs',
-            details=f'ייצוא CSV של {len(logs)} רשומות'
-        )
+        # Export as CSV (default or fallback), streamed one database batch at a time
+        def generate_csv():
+            output = io.StringIO()
+            writer = csv.writer(output)
+            writer.writerow(headers)
+            
+            count = 0
+            for rows in db.iter_audit_log_rows(AUDIT_EXPORT_COLUMNS, **filters):
+                writer.writerows(rows)
+                count += len(rows)
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+            yield output.getvalue()
+            
+            # Log the export
+            audit_logger.log_success(
+                audit_logger.ACTION_EXPORT,
+                'audit_logs',
+                details=f'ייצוא CSV של {count} רשומות'
+            )
         
+        response = current_app.response_class(stream_with_context(generate_csv()), mimetype='text/csv')
+        response.headers['Content-Disposition'] = f'attachment; filename=audit_logs_{timestamp_str}.csv'
         return response
         
     except Exception as e:
@@ -260,8 +240,10 @@ def ad_settings():
     """Active Directory settings page"""
     try:
         # Get all AD settings
+        settings = db.get_system_settings(['ad_enabled', 'ad_admin_group', 'ad_manager_group',
+                                           'ad_auto_create_users', 'ad_default_hativa_id', 'ad_sync_on_login'])
         ad_config = {
-            'enabled': db.get_system_setting('ad_enabled') == '1',
+            'enabled': settings['ad_enabled'] == '1',
             'auth_method': 'oauth',  # Always OAuth for Azure AD
             
             # Azure AD OAuth Settings - from .env file
@@ -271,25 +253,25 @@ def ad_settings():
             'azure_redirect_uri': os.getenv('AZURE_REDIRECT_URI', ''),
             
             # Common Settings - from database
-            'admin_group': db.get_system_setting('ad_admin_group') or '',
-            'manager_group': db.get_system_setting('ad_manager_group') or '',
-            'auto_create_users': db.get_system_setting('ad_auto_create_users') == '1',
-            'default_hativa_id': db.get_system_setting('ad_default_hativa_id') or '',
-            'sync_on_login': db.get_system_setting('ad_sync_on_login') == '1'
+            'admin_group': settings['ad_admin_group'] or '',
+            'manager_group': settings['ad_manager_group'] or '',
+            'auto_create_users': settings['ad_auto_create_users'] == '1',
+            'default_hativa_id': settings['ad_default_hativa_id'] or '',
+            'sync_on_login': settings['ad_sync_on_login'] == '1'
         }
         
         # Get hativot for default division selection
         hativot = db.get_hativot()
         
         # Get AD users count
-        ad_users = db.get_ad_users()
+        ad_users_count = db.count_ad_users()
         
         current_user = auth_manager.get_current_user()
         
         return render_template('admin/ad_settings.html',
                              ad_config=ad_config,
                              hativot=hativot,
-                             ad_users_count=len(ad_users),
+                             ad_users_count=ad_users_count,
                              current_user=current_user)
     except Exception as e:
         current_app.logger.error(f'Error loading AD settings: {str(e)}')
@@ -317,8 +299,7 @@ def update_ad_settings():
         }
         
         # Update all settings
-        for key, value in settings.items():
-            db.update_system_setting(key, value, user_id)
+        db.update_system_settings(settings, user_id)
         
         # Reload AD service with new settings
         ad_service.reload_settings()
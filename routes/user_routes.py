@@ -1,3 +1,4 @@
+from collections import Counter
 from flask import Blueprint, render_template, request, flash, redirect, url_for, current_app
 from services_init import db, auth_manager, audit_logger
 from auth import admin_required, login_required
@@ -12,20 +13,18 @@ def manage_users():
     hativot = db.get_hativot()
     current_user = auth_manager.get_current_user()
     
-    # Statistics
+    # Statistics (the full list is rendered anyway, so count it in one pass)
     total_users = len(users)
-    active_users = len([u for u in users if u['is_active']])
-    admin_count = len([u for u in users if u['role'] == 'admin'])
-    editor_count = len([u for u in users if u['role'] == 'editor'])
-    viewer_count = len([u for u in users if u['role'] == 'viewer'])
+    active_users = sum(1 for u in users if u['is_active'])
+    role_counts = Counter(u['role'] for u in users)
     
     stats = {
         'total_users': total_users,
         'active_users': active_users,
         'inactive_users': total_users - active_users,
-        'admin_count': admin_count,
-        'editor_count': editor_count,
-        'viewer_count': viewer_count
+        'admin_count': role_counts['admin'],
+        'editor_count': role_counts['editor'],
+        'viewer_count': role_counts['viewer']
     }
     
     return render_template('admin/users.html', 
@@ -63,13 +62,13 @@ def update_user():
             flash('תפקיד לא חוקי', 'error')
             return redirect(url_for('users.manage_users'))
         
-        # Check if username exists (excluding current user)
-        if db.check_username_exists(username, user_id):
+        # Check if username or email exist (excluding current user)
+        username_exists, email_exists = db.check_user_conflicts(username, email, user_id)
+        if username_exists:
             flash('שם המשתמש כבר קיים במערכת', 'error')
             return redirect(url_for('users.manage_users'))
         
-        # Check if email exists (excluding current user)
-        if db.check_email_exists(email, user_id):
+        if email_exists:
             flash('כתובת האימייל כבר קיימת במערכת', 'error')
             return redirect(url_for('users.manage_users'))
         
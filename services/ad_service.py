@@ -1,6 +1,4 @@
-import msal
 import requests
-import jwt
 from datetime import datetime, timedelta
 import os
 import logging
@@ -210,6 +208,8 @@ class ADService:
     
     def _get_msal_app(self):
         """Create MSAL confidential client application"""
+        # Imported on first use - msal (with its crypto stack) is only needed for sign-in flows
+        import msal
         return msal.ConfidentialClientApplication(
             client_id=self.azure_client_id,
             client_credential=self.azure_client_secret,
@@ -300,6 +300,7 @@ class ADService:
                 logger.info("ID token found. Decoding...")
                 id_token = token_response["id_token"]
                 # Decode without verification (already verified by MSAL)
+                import jwt
                 claims = jwt.decode(id_token, options={"verify_signature": False})
                 
                 logger.info(f"Token claims: {list(claims.keys())}")
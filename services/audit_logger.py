@@ -7,10 +7,18 @@ This service provides a clean interface for logging user activities
 throughout the application.
 """
 
-from typing import Optional, Dict, Any
+import atexit
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
 from flask import session, request
 from database import DatabaseManager
 
+logger = logging.getLogger(__name__)
+
 
 class AuditLogger:
     """Service for logging user actions and system events"""
@@ -43,17 +51,105 @@ class AuditLogger:
     ENTITY_SESSION = 'session'
     ENTITY_SCHEDULE = 'schedule'
     
+    # Background writer - entries are batched off the request path
+    QUEUE_MAXSIZE = 10000
+    BATCH_SIZE = 200
+    BATCH_WINDOW_SECONDS = 0.1
+    _STOP = object()
+    
     def __init__(self, db: DatabaseManager):
         self.db = db
+        self._queue: queue.Queue = queue.Queue(maxsize=self.QUEUE_MAXSIZE)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        atexit.register(self.flush)
+    
+    def _enqueue(self, entry: Dict[str, Any]) -> None:
+        """Queue an entry for the background writer (written inline if the queue is full)"""
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.db.add_audit_log(**entry)
+    
+    def _ensure_writer(self) -> None:
+        """Start the writer thread on first use (and again in a forked worker)"""
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._run_writer, name='audit-log-writer', daemon=True)
+                self._writer.start()
+    
+    def _run_writer(self) -> None:
+        """Drain the queue, writing up to BATCH_SIZE entries per BATCH_WINDOW_SECONDS in one INSERT"""
+        while True:
+            entry = self._queue.get()
+            if entry is self._STOP:
+                return
+            batch = [entry]
+            stop = False
+            deadline = time.monotonic() + self.BATCH_WINDOW_SECONDS
+            while len(batch) < self.BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is self._STOP:
+                    stop = True
+                    break
+                batch.append(entry)
+            self._write_batch(batch)
+            if stop:
+                return
+    
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Write a batch in one INSERT, falling back to one INSERT per entry if that fails"""
+        try:
+            self.db.add_audit_logs(batch)
+            return
+        except Exception:
+            logger.exception("Failed to write %d queued audit log entries as a batch; retrying one by one",
+                             len(batch))
+        for entry in batch:
+            try:
+                self.db.add_audit_log(**entry)
+            except Exception:
+                logger.exception("Dropped audit log entry %s %s", entry.get('action'), entry.get('entity_type'))
+    
+    def flush(self, timeout: float = 5.0) -> None:
+        """Stop the writer after it has written everything queued so far (called at interpreter exit)"""
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            # The sentinel queues behind every pending entry, including a batch being collected
+            try:
+                self._queue.put(self._STOP, timeout=timeout)
+                writer.join(timeout)
+            except queue.Full:
+                pass
+        # Write inline whatever the writer could not (none started, or it timed out)
+        batch = []
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not self._STOP:
+                batch.append(entry)
+        if batch:
+            self._write_batch(batch)
     
     def log(self, action: str, entity_type: str, 
             entity_id: Optional[int] = None,
             entity_name: Optional[str] = None,
             details: Optional[str] = None,
             status: str = 'success',
-            error_message: Optional[str] = None) -> int:
+            error_message: Optional[str] = None) -> None:
         """
-        Log an action
+        Log an action (written by the background writer)
         
         Args:
             action: Type of action (use ACTION_* constants)
@@ -63,9 +159,6 @@ class AuditLogger:
             details: Additional details (optional)
             status: 'success' or 'error'
             error_message: Error message if status is 'error'
-        
-        Returns:
-            log_id: ID of the created log entry
         """
         # Get user info from session
         user_id = session.get('user_id')
@@ -75,72 +168,117 @@ class AuditLogger:
         ip_address = self._get_client_ip()
         user_agent = request.headers.get('User-Agent', '')[:200]  # Limit length
         
-        return self.db.add_audit_log(
-            user_id=user_id,
-            username=username,
-            action=action,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            entity_name=entity_name,
-            details=details,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            status=status,
-            error_message=error_message
-        )
+        self._enqueue({
+            'user_id': user_id,
+            'username': username,
+            'action': action,
+            'entity_type': entity_type,
+            'entity_id': entity_id,
+            'entity_name': entity_name,
+            'details': details,
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+            'status': status,
+            'error_message': error_message,
+            'timestamp': datetime.now()
+        })
+    
+    def log_bulk(self, action: str, entity_type: str,
+                 items: List[Tuple[Optional[int], Optional[str]]],
+                 details: Optional[str] = None,
+                 status: str = 'success') -> int:
+        """
+        Log the same action for many entities (written by the background writer in batches)
+        
+        Args:
+            action: Type of action (use ACTION_* constants)
+            entity_type: Type of entity affected (use ENTITY_* constants)
+            items: (entity_id, entity_name) pairs, one log entry each
+            details: Additional details shared by all entries (optional)
+            status: 'success' or 'error'
+        
+        Returns:
+            Number of log entries queued
+        """
+        common = {
+            'user_id': session.get('user_id'),
+            'username': session.get('username', 'Unknown'),
+            'action': action,
+            'entity_type': entity_type,
+            'details': details,
+            'ip_address': self._get_client_ip(),
+            'user_agent': request.headers.get('User-Agent', '')[:200],
+            'status': status,
+            'error_message': None,
+            'timestamp': datetime.now()
+        }
+        for entity_id, entity_name in items:
+            self._enqueue({**common, 'entity_id': entity_id, 'entity_name': entity_name})
+        return len(items)
     
     def log_success(self, action: str, entity_type: str,
                    entity_id: Optional[int] = None,
                    entity_name: Optional[str] = None,
-                   details: Optional[str] = None) -> int:
+                   details: Optional[str] = None) -> None:
         """Log a successful action"""
-        return self.log(action, entity_type, entity_id, entity_name, details, 'success')
+        self.log(action, entity_type, entity_id, entity_name, details, 'success')
     
     def log_error(self, action: str, entity_type: str,
                  error_message: str,
                  entity_id: Optional[int] = None,
                  entity_name: Optional[str] = None,
-                 details: Optional[str] = None) -> int:
+                 details: Optional[str] = None) -> None:
         """Log a failed action"""
-        return self.log(action, entity_type, entity_id, entity_name, details, 'error', error_message)
-    
-    def log_login(self, username: str, success: bool, reason: Optional[str] = None) -> int:
-        """Log a login attempt"""
-        return self.db.add_audit_log(
-            user_id=None,
-            username=username,
-            action=self.ACTION_LOGIN if success else self.ACTION_LOGIN_FAILED,
-            entity_type=self.ENTITY_SESSION,
-            entity_name=username,
-            details=reason,
-            ip_address=self._get_client_ip(),
-            user_agent=request.headers.get('User-Agent', '')[:200],
-            status='success' if success else 'error',
-            error_message=reason if not success else None
-        )
-    
-    def log_logout(self, username: str) -> int:
-        """Log a logout"""
-        return self.log_success(
-            self.ACTION_LOGOUT,
-            self.ENTITY_SESSION,
-            entity_name=username
-        )
+        self.log(action, entity_type, entity_id, entity_name, details, 'error', error_message)
+    
+    def log_login(self, username: str, success: bool, reason: Optional[str] = None) -> None:
+        """Log a login attempt (written by the background writer)"""
+        self._enqueue({
+            'user_id': None,
+            'username': username,
+            'action': self.ACTION_LOGIN if success else self.ACTION_LOGIN_FAILED,
+            'entity_type': self.ENTITY_SESSION,
+            'entity_id': None,
+            'entity_name': username,
+            'details': reason,
+            'ip_address': self._get_client_ip(),
+            'user_agent': request.headers.get('User-Agent', '')[:200],
+            'status': 'success' if success else 'error',
+            'error_message': reason if not success else None,
+            'timestamp': datetime.now()
+        })
+    
+    def log_logout(self, username: str) -> None:
+        """Log a logout (written by the background writer)"""
+        self._enqueue({
+            'user_id': session.get('user_id'),
+            'username': session.get('username', 'Unknown'),
+            'action': self.ACTION_LOGOUT,
+            'entity_type': self.ENTITY_SESSION,
+            'entity_id': None,
+            'entity_name': username,
+            'details': None,
+            'ip_address': self._get_client_ip(),
+            'user_agent': request.headers.get('User-Agent', '')[:200],
+            'status': 'success',
+            'error_message': None,
+            'timestamp': datetime.now()
+        })
     
     # Convenience methods for common operations
     
-    def log_hativa_created(self, hativa_id: int, name: str) -> int:
+    def log_hativa_created(self, hativa_id: int, name: str) -> None:
         """Log creation of a hativa"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_CREATE,
             self.ENTITY_HATIVA,
             entity_id=hativa_id,
             entity_name=name
         )
     
-    def log_hativa_updated(self, hativa_id: int, name: str, changes: Optional[str] = None) -> int:
+    def log_hativa_updated(self, hativa_id: int, name: str, changes: Optional[str] = None) -> None:
         """Log update of a hativa"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_UPDATE,
             self.ENTITY_HATIVA,
             entity_id=hativa_id,
@@ -148,10 +286,10 @@ class AuditLogger:
             details=changes
         )
     
-    def log_hativa_toggled(self, hativa_id: int, name: str, is_active: bool) -> int:
+    def log_hativa_toggled(self, hativa_id: int, name: str, is_active: bool) -> None:
         """Log toggling of a hativa"""
         status = 'הופעלה' if is_active else 'הושבתה'
-        return self.log_success(
+        self.log_success(
             self.ACTION_TOGGLE,
             self.ENTITY_HATIVA,
             entity_id=hativa_id,
@@ -159,9 +297,9 @@ class AuditLogger:
             details=f'החטיבה {status}'
         )
     
-    def log_maslul_created(self, maslul_id: int, name: str, hativa_name: str) -> int:
+    def log_maslul_created(self, maslul_id: int, name: str, hativa_name: str) -> None:
         """Log creation of a maslul"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_CREATE,
             self.ENTITY_MASLUL,
             entity_id=maslul_id,
@@ -169,9 +307,9 @@ class AuditLogger:
             details=f'בחטיבת {hativa_name}'
         )
     
-    def log_maslul_updated(self, maslul_id: int, name: str, changes: Optional[str] = None) -> int:
+    def log_maslul_updated(self, maslul_id: int, name: str, changes: Optional[str] = None) -> None:
         """Log update of a maslul"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_UPDATE,
             self.ENTITY_MASLUL,
             entity_id=maslul_id,
@@ -179,19 +317,19 @@ class AuditLogger:
             details=changes
         )
     
-    def log_maslul_deleted(self, maslul_id: int, name: str) -> int:
+    def log_maslul_deleted(self, maslul_id: int, name: str) -> None:
         """Log deletion of a maslul"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_DELETE,
             self.ENTITY_MASLUL,
             entity_id=maslul_id,
             entity_name=name
         )
     
-    def log_maslul_toggled(self, maslul_id: int, name: str, is_active: bool) -> int:
+    def log_maslul_toggled(self, maslul_id: int, name: str, is_active: bool) -> None:
         """Log toggling of a maslul"""
         status = 'הופעל' if is_active else 'הושבת'
-        return self.log_success(
+        self.log_success(
             self.ACTION_TOGGLE,
             self.ENTITY_MASLUL,
             entity_id=maslul_id,
@@ -199,9 +337,9 @@ class AuditLogger:
             details=f'המסלול {status}'
         )
     
-    def log_committee_type_created(self, ct_id: int, name: str, hativa_name: str) -> int:
+    def log_committee_type_created(self, ct_id: int, name: str, hativa_name: str) -> None:
         """Log creation of a committee type"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_CREATE,
             self.ENTITY_COMMITTEE_TYPE,
             entity_id=ct_id,
@@ -209,28 +347,28 @@ class AuditLogger:
             details=f'בחטיבת {hativa_name}'
         )
     
-    def log_committee_type_updated(self, ct_id: int, name: str) -> int:
+    def log_committee_type_updated(self, ct_id: int, name: str) -> None:
         """Log update of a committee type"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_UPDATE,
             self.ENTITY_COMMITTEE_TYPE,
             entity_id=ct_id,
             entity_name=name
         )
     
-    def log_committee_type_deleted(self, ct_id: int, name: str) -> int:
+    def log_committee_type_deleted(self, ct_id: int, name: str) -> None:
         """Log deletion of a committee type"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_DELETE,
             self.ENTITY_COMMITTEE_TYPE,
             entity_id=ct_id,
             entity_name=name
         )
     
-    def log_committee_type_toggled(self, ct_id: int, name: str, is_active: bool) -> int:
+    def log_committee_type_toggled(self, ct_id: int, name: str, is_active: bool) -> None:
         """Log toggling of a committee type"""
         status = 'הופעל' if is_active else 'הושבת'
-        return self.log_success(
+        self.log_success(
             self.ACTION_TOGGLE,
             self.ENTITY_COMMITTEE_TYPE,
             entity_id=ct_id,
@@ -238,9 +376,9 @@ class AuditLogger:
             details=f'סוג הועדה {status}'
         )
     
-    def log_vaada_created(self, vaada_id: int, committee_name: str, date: str) -> int:
+    def log_vaada_created(self, vaada_id: int, committee_name: str, date: str) -> None:
         """Log creation of a vaada"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_CREATE,
             self.ENTITY_VAADA,
             entity_id=vaada_id,
@@ -248,9 +386,9 @@ class AuditLogger:
             details=f'תאריך: {date}'
         )
     
-    def log_vaada_updated(self, vaada_id: int, committee_name: str, date: str) -> int:
+    def log_vaada_updated(self, vaada_id: int, committee_name: str, date: str) -> None:
         """Log update of a vaada"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_UPDATE,
             self.ENTITY_VAADA,
             entity_id=vaada_id,
@@ -258,9 +396,9 @@ class AuditLogger:
             details=f'תאריך: {date}'
         )
     
-    def log_vaada_moved(self, vaada_id: int, committee_name: str, old_date: str, new_date: str) -> int:
+    def log_vaada_moved(self, vaada_id: int, committee_name: str, old_date: str, new_date: str) -> None:
         """Log moving of a vaada"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_MOVE,
             self.ENTITY_VAADA,
             entity_id=vaada_id,
@@ -268,18 +406,18 @@ class AuditLogger:
             details=f'מ-{old_date} ל-{new_date}'
         )
     
-    def log_vaada_deleted(self, vaada_id: int, committee_name: str) -> int:
+    def log_vaada_deleted(self, vaada_id: int, committee_name: str) -> None:
         """Log deletion of a vaada"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_DELETE,
             self.ENTITY_VAADA,
             entity_id=vaada_id,
             entity_name=committee_name
         )
     
-    def log_event_created(self, event_id: int, name: str, committee_name: str) -> int:
+    def log_event_created(self, event_id: int, name: str, committee_name: str) -> None:
         """Log creation of an event"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_CREATE,
             self.ENTITY_EVENT,
             entity_id=event_id,
@@ -287,18 +425,18 @@ class AuditLogger:
             details=f'בועדה: {committee_name}'
         )
     
-    def log_event_updated(self, event_id: int, name: str) -> int:
+    def log_event_updated(self, event_id: int, name: str) -> None:
         """Log update of an event"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_UPDATE,
             self.ENTITY_EVENT,
             entity_id=event_id,
             entity_name=name
         )
     
-    def log_event_moved(self, event_id: int, name: str, old_committee: str, new_committee: str) -> int:
+    def log_event_moved(self, event_id: int, name: str, old_committee: str, new_committee: str) -> None:
         """Log moving of an event"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_MOVE,
             self.ENTITY_EVENT,
             entity_id=event_id,
@@ -306,18 +444,18 @@ class AuditLogger:
             details=f'מ-{old_committee} ל-{new_committee}'
         )
     
-    def log_event_deleted(self, event_id: int, name: str) -> int:
+    def log_event_deleted(self, event_id: int, name: str) -> None:
         """Log deletion of an event"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_DELETE,
             self.ENTITY_EVENT,
             entity_id=event_id,
             entity_name=name
         )
     
-    def log_user_created(self, user_id: int, username: str, role: str) -> int:
+    def log_user_created(self, user_id: int, username: str, role: str) -> None:
         """Log creation of a user"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_CREATE,
             self.ENTITY_USER,
             entity_id=user_id,
@@ -325,19 +463,19 @@ class AuditLogger:
             details=f'תפקיד: {role}'
         )
     
-    def log_user_updated(self, user_id: int, username: str) -> int:
+    def log_user_updated(self, user_id: int, username: str) -> None:
         """Log update of a user"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_UPDATE,
             self.ENTITY_USER,
             entity_id=user_id,
             entity_name=username
         )
     
-    def log_user_toggled(self, user_id: int, username: str, is_active: bool) -> int:
+    def log_user_toggled(self, user_id: int, username: str, is_active: bool) -> None:
         """Log toggling of a user"""
         status = 'הופעל' if is_active else 'הושבת'
-        return self.log_success(
+        self.log_success(
             self.ACTION_TOGGLE,
             self.ENTITY_USER,
             entity_id=user_id,
@@ -345,19 +483,19 @@ class AuditLogger:
             details=f'המשתמש {status}'
         )
     
-    def log_user_deleted(self, user_id: int, username: str) -> int:
+    def log_user_deleted(self, user_id: int, username: str) -> None:
         """Log deletion of a user"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_DELETE,
             self.ENTITY_USER,
             entity_id=user_id,
             entity_name=username
         )
     
-    def log_user_password_changed(self, user_id: int, username: str, by_admin: bool = False) -> int:
+    def log_user_password_changed(self, user_id: int, username: str, by_admin: bool = False) -> None:
         """Log password change"""
         details = 'על ידי מנהל' if by_admin else 'על ידי המשתמש'
-        return self.log_success(
+        self.log_success(
             self.ACTION_UPDATE,
             self.ENTITY_USER,
             entity_id=user_id,
@@ -365,36 +503,36 @@ class AuditLogger:
             details=f'שינוי סיסמה {details}'
         )
     
-    def log_system_setting_updated(self, setting_key: str, old_value: str, new_value: str) -> int:
+    def log_system_setting_updated(self, setting_key: str, old_value: str, new_value: str) -> None:
         """Log system setting update"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_UPDATE,
             self.ENTITY_SYSTEM_SETTINGS,
             entity_name=setting_key,
             details=f'מ-"{old_value}" ל-"{new_value}"'
         )
     
-    def log_auto_schedule_generated(self, year: int, month: int, count: int) -> int:
+    def log_auto_schedule_generated(self, year: int, month: int, count: int) -> None:
         """Log auto-schedule generation"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_AUTO_SCHEDULE,
             self.ENTITY_SCHEDULE,
             entity_name=f'{year}-{month:02d}',
             details=f'נוצרו {count} הצעות ישיבות'
         )
     
-    def log_schedule_approved(self, year: int, month: int, approved_count: int, total_count: int) -> int:
+    def log_schedule_approved(self, year: int, month: int, approved_count: int, total_count: int) -> None:
         """Log schedule approval"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_APPROVE,
             self.ENTITY_SCHEDULE,
             entity_name=f'{year}-{month:02d}',
             details=f'אושרו {approved_count} מתוך {total_count} ישיבות'
         )
     
-    def log_exception_date_added(self, date_id: int, date_str: str, description: str) -> int:
+    def log_exception_date_added(self, date_id: int, date_str: str, description: str) -> None:
         """Log addition of exception date"""
-        return self.log_success(
+        self.log_success(
             self.ACTION_CREATE,
             self.ENTITY_EXCEPTION_DATE,
             entity_id=date_id,
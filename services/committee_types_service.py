@@ -196,8 +196,7 @@ class CommitteeTypesService:
             self.validate_committee_type_data(request)
             
             # Check if committee type exists
-            existing_types = self.db.get_committee_types()
-            current_type = next((ct for ct in existing_types if ct['committee_type_id'] == committee_type_id), None)
+            current_type = self.db.get_committee_type_by_id(committee_type_id)
             if not current_type:
                 raise ValidationError('סוג הועדה לא נמצא במערכת')
             
@@ -251,8 +250,7 @@ class CommitteeTypesService:
                 raise ValidationError('מזהה סוג ועדה חסר')
             
             # Check if committee type exists
-            existing_types = self.db.get_committee_types()
-            current_type = next((ct for ct in existing_types if ct['committee_type_id'] == committee_type_id), None)
+            current_type = self.db.get_committee_type_by_id(committee_type_id)
             if not current_type:
                 raise ValidationError('סוג הועדה לא נמצא במערכת')
             
@@ -290,8 +288,7 @@ class CommitteeTypesService:
         try:
             logger.info(f"Fetching committee type by ID: {committee_type_id}")
             
-            committee_types = self.db.get_committee_types()
-            committee_type = next((ct for ct in committee_types if ct['committee_type_id'] == committee_type_id), None)
+            committee_type = self.db.get_committee_type_by_id(committee_type_id)
             
             if committee_type:
                 logger.info(f"Committee type found: {committee_type['name']}")
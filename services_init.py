@@ -1,3 +1,4 @@
+from flask_caching import Cache
 from database import DatabaseManager
 from services.ad_service import ADService
 from services.auto_schedule_service import AutoScheduleService
@@ -13,6 +14,9 @@ from auth import AuthManager
 # Initialize database
 db = DatabaseManager()
 
+# Shared cache (configured in app.py via cache.init_app)
+cache = Cache()
+
 # Initialize services
 ad_service = ADService(db)
 auto_scheduler = AutoMeetingScheduler(db)
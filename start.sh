@@ -54,5 +54,5 @@ fi
 echo ""
 echo "🌟 Step 5: Starting application server..."
 echo "==========================================="
-exec gunicorn --bind 0.0.0.0:$PORT --timeout 300 application:application
+exec gunicorn --bind 0.0.0.0:$PORT --timeout 300 --threads 4 application:application
 
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the AuditLogger background writer.
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Logs a few entries and exits shortly after - long enough for the writer thread to
+# take them off the queue, while the long batch window keeps it collecting
+LOG_AND_EXIT = """
+import sys
+import time
+sys.path.insert(0, {root!r})
+from flask import Flask
+from database import DatabaseManager
+from services.audit_logger import AuditLogger
+
+AuditLogger.BATCH_WINDOW_SECONDS = 30
+audit_logger = AuditLogger(DatabaseManager())
+with Flask(__name__).test_request_context('/'):
+    for i in range({count}):
+        audit_logger.log(audit_logger.ACTION_UPDATE, audit_logger.ENTITY_EVENT, entity_id=i)
+time.sleep(0.05)
+"""
+
+
+def test_queued_entries_are_written_at_exit(tmp_path):
+    db_path = tmp_path / 'audit.db'
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{db_path}')
+    script = LOG_AND_EXIT.format(root=REPO_ROOT, count=5)
+
+    subprocess.run([sys.executable, '-c', script], env=env, check=True, timeout=60)
+
+    with sqlite3.connect(db_path) as conn:
+        count = conn.execute('SELECT COUNT(*) FROM audit_logs').fetchone()[0]
+    assert count == 5
+
+
+class FailingBatchDB:
+    """Rejects batch INSERTs and the entry with entity_id 1; records single-entry writes."""
+
+    def __init__(self):
+        self.written = []
+
+    def add_audit_logs(self, entries):
+        raise RuntimeError('batch insert failed')
+
+    def add_audit_log(self, **entry):
+        if entry['entity_id'] == 1:
+            raise RuntimeError('bad entry')
+        self.written.append(entry['entity_id'])
+
+
+def test_failed_batch_falls_back_to_single_writes(tmp_path, monkeypatch):
+    # Importing the service builds the database engine
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'unused.db'}")
+    monkeypatch.syspath_prepend(REPO_ROOT)
+    from services.audit_logger import AuditLogger
+
+    db = FailingBatchDB()
+    AuditLogger(db)._write_batch([{'action': 'update', 'entity_type': 'event', 'entity_id': i}
+                                  for i in range(3)])
+
+    assert db.written == [0, 2]